@@ -0,0 +1,282 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # repo root
+from run_metrics import current_run  # noqa: E402
+
+# Airtable config shared by every export script
+BASE_ID = 'app0Ljjhrp3lTTpTO'
+API_URL = 'https://api.airtable.com/v0'
+RATE_LIMIT = 5           # Airtable allows 5 requests/sec per base
+RETRY_AFTER_429 = 30     # seconds Airtable asks clients to back off after a 429
+MAX_RETRIES = 3
+
+# On-disk cache of full table downloads, used for the static reference lists only
+CACHE_DIR = '.cache/airtable'
+CACHE_TTL = 7 * 24 * 3600  # seconds; reference tables rarely change
+CACHED_TABLES = ('Economy Reference List', 'Workstream Reference List')
+
+# Airtable record IDs: "rec" plus 14 alphanumerics
+RECORD_ID_RE = re.compile(r'rec[A-Za-z0-9]{14}')
+
+
+class AirtableError(Exception):
+    """Airtable answered without a `records` list (bad token, unknown field, ...)."""
+
+    def __init__(self, message, records=()):
+        super().__init__(message)
+        self.records = list(records)  # pages received before the error
+
+
+class ResponseCache:
+    """Table downloads stored as JSON files, keyed by base, table, view and params."""
+
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, key):
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key):
+        """Cached records, or None when missing or older than the TTL."""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry['fetched_at'] > self.ttl:
+            return None
+        return entry['records']
+
+    def put(self, key, records):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'fetched_at': time.time(), 'records': records}, f)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class LookupMap(dict):
+    """Record ID → display value built from a cached table.
+
+    A record ID that isn't in the map means the cached copy may be stale,
+    so the first such miss downloads the table again (once per map). Misses
+    on values that aren't record IDs (plain text typed into a link field,
+    like "Thailand") can't be fixed by a refresh and don't trigger one.
+    """
+
+    def __init__(self, data, refresh=None):
+        super().__init__(data)
+        self._refresh = refresh
+        self._lock = threading.Lock()
+
+    def _refresh_on_miss(self, key):
+        if self._refresh is None or dict.__contains__(self, key):
+            return
+        if not isinstance(key, str) or not RECORD_ID_RE.fullmatch(key):
+            return
+        with self._lock:
+            refresh, self._refresh = self._refresh, None
+        if refresh is not None:
+            self.update(refresh())
+
+    def __contains__(self, key):
+        self._refresh_on_miss(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        self._refresh_on_miss(key)
+        return dict.get(self, key, default)
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests at least 1/rate seconds apart."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AirtableClient:
+    """One pooled HTTP session for all exports in a run.
+
+    Every table download is memoized for the lifetime of the client. The
+    reference tables are fetched once even when several exports running in
+    parallel ask for them at the same moment. Callers get their own copy
+    of the records, so they can mutate `fields` freely. With a
+    ResponseCache, the reference lists in CACHED_TABLES are also reused
+    across runs until the TTL expires.
+    """
+
+    def __init__(self, token, base_id=BASE_ID, api_url=API_URL, rate=RATE_LIMIT, pool_size=10, replica=None,
+                 cache=None):
+        self.base_id = base_id
+        self.replica = replica
+        self.cache = cache
+        self.api_url = api_url.rstrip('/')
+        self.limiter = RateLimiter(rate)
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {token}"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._memo = {}
+        self._memo_locks = {}
+        self._downloaded = set()  # keys fetched from Airtable (not the disk cache) in this run
+        self._memo_guard = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        # Set AIRTABLE_REPLICA to an empty string to always fetch main tables in full
+        from airtable_sync import REPLICA_PATH, AirtableReplica
+        replica_path = os.environ.get('AIRTABLE_REPLICA', REPLICA_PATH)
+        # AIRTABLE_CACHE_TTL=0 turns the response cache off
+        cache_ttl = float(os.environ.get('AIRTABLE_CACHE_TTL', CACHE_TTL))
+        return cls(
+            os.environ['AIRTABLE_TOKEN'],
+            base_id=os.environ.get('AIRTABLE_BASE_ID', BASE_ID),
+            api_url=os.environ.get('AIRTABLE_API_URL', API_URL),
+            replica=AirtableReplica(replica_path) if replica_path else None,
+            cache=ResponseCache(os.environ.get('AIRTABLE_CACHE_DIR', CACHE_DIR), cache_ttl) if cache_ttl > 0 else None,
+        )
+
+    def _get(self, url, params):
+        host = urlsplit(url).netloc
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.get(url, params=params, timeout=60)
+            current_run().record_http(
+                host, nbytes=len(response.content), retries=1 if attempt else 0,
+                errors=1 if response.status_code >= 400 else 0,
+            )
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response.json()
+            print(f"⏳ Rate limited by Airtable, retrying in {RETRY_AFTER_429}s")
+            time.sleep(RETRY_AFTER_429)
+
+    def fetch_pages(self, table, view=None, params=None):
+        """Every page of a table listing. Raises AirtableError on an error response."""
+        url = f"{self.api_url}/{self.base_id}/{quote(table)}"
+        params, all_records, offset = (dict(params or {}), [], None)
+        if view:
+            params['view'] = view
+
+        while True:
+            if offset:
+                params['offset'] = offset
+            response = self._get(url, params)
+
+            if 'records' not in response:
+                raise AirtableError(f"{table}: {response}", all_records)
+
+            all_records.extend(response['records'])
+            offset = response.get('offset')
+            if not offset:
+                break
+
+        return all_records
+
+    def fetch_all_records(self, table, view=None, use_cache=False, refresh=False):
+        """Every record of a table, memoized for the run.
+
+        `use_cache` also serves it from the on-disk cache (used for the
+        reference lists); `refresh` forces one network download per run.
+        """
+        key = (table, view)
+        cache_key = {'base': self.base_id, 'table': table, 'view': view, 'params': None}
+        with self._memo_guard:
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+        with lock:
+            if (refresh and key not in self._downloaded) or key not in self._memo:
+                cached = self.cache.get(cache_key) if self.cache and use_cache and not refresh else None
+                if cached is not None:
+                    self._memo[key] = cached
+                    print(f"📦 Loaded {len(cached)} cached records from '{table}'")
+                else:
+                    try:
+                        self._memo[key] = self.fetch_pages(table, view)
+                        self._downloaded.add(key)
+                        if self.cache and use_cache:
+                            self.cache.put(cache_key, self._memo[key])
+                    except AirtableError as e:
+                        print(f"❌ Error fetching {e}")
+                        self._memo[key] = e.records
+                    print(f"✅ Fetched {len(self._memo[key])} records from '{table}'")
+                    current_run().count('airtable_records_fetched', len(self._memo[key]))
+        return copy.deepcopy(self._memo[key])
+
+    def sync_records(self, table, view=None):
+        """Main-table records, served from the local replica when one is configured."""
+        if self.replica is None:
+            records = self.fetch_all_records(table, view=view)
+        else:
+            records = self.replica.sync(self, table, view=view)
+        current_run().count('main_table_records', len(records))
+        return records
+
+    def linked_records(self, table):
+        """Records of a linked table.
+
+        The reference lists in CACHED_TABLES may come from the on-disk cache.
+        Other linked tables (OT4, OT5, ...) are edited often, so they are read
+        fresh every run: synced into the replica (once per run) when one is
+        configured, downloaded in full otherwise.
+        """
+        if table in CACHED_TABLES:
+            return self.fetch_all_records(table, use_cache=True)
+        if self.replica is None:
+            return self.fetch_all_records(table)
+        key = ('replica', table)
+        with self._memo_guard:
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = self.replica.sync(self, table)
+        return copy.deepcopy(self._memo[key])
+
+    def lookup(self, table, display_field):
+        """Map of record ID → display value for a linked table."""
+        def build(records):
+            return {rec['id']: rec['fields'].get(display_field, 'Unknown') for rec in records}
+
+        def refresh():
+            print(f"🔄 Unknown record ID in '{table}', downloading it again")
+            return build(self.fetch_all_records(table, use_cache=True, refresh=True))
+
+        # Only a cached table can be stale enough to miss a record ID
+        cached = self.cache is not None and table in CACHED_TABLES
+        return LookupMap(build(self.linked_records(table)), refresh if cached else None)
+
+    def lookup_maps(self, linked_tables, display_fields):
+        """Lookup maps for every linked field, keyed by the field name used in the main table."""
+        return {
+            field: self.lookup(table_name, display_fields[field])
+            for field, table_name in linked_tables.items()
+        }
@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from airtable_client import AirtableError
+
+REPLICA_PATH = '.cache/airtable_replica.sqlite'
+CURSOR_OVERLAP = timedelta(minutes=5)  # re-read a small window to absorb clock skew
+PAGE_SIZE = 100  # Airtable's page size; a table that fits in one page is cheapest to re-read whole
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    table_name   TEXT NOT NULL,
+    view         TEXT NOT NULL,
+    id           TEXT NOT NULL,
+    position     INTEGER,
+    created_time TEXT,
+    fields       TEXT NOT NULL,
+    PRIMARY KEY (table_name, view, id)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    table_name TEXT NOT NULL,
+    view       TEXT NOT NULL,
+    synced_at  TEXT NOT NULL,
+    PRIMARY KEY (table_name, view)
+);
+"""
+
+
+class AirtableReplica:
+    """Local SQLite copy of the main tables, kept current with modified-time cursors.
+
+    The first sync of a table downloads it in full, as does every sync of a
+    table small enough to fit in one page. Later syncs only fetch
+    records whose LAST_MODIFIED_TIME() is after the stored cursor. A second
+    listing that returns record IDs only (one field) drops records that were
+    deleted or left the view, and restores the view order. If either
+    listing fails, the table is re-read in full.
+    """
+
+    def __init__(self, path=REPLICA_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def _cursor(self, table, view):
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT synced_at FROM cursors WHERE table_name = ? AND view = ?", (table, view)
+            ).fetchone()
+            # Airtable leaves empty fields out, so the field set on the most records is
+            # the primary field (never empty in practice); ties go to the name, not dict order
+            key = conn.execute(
+                "SELECT f.key FROM records, json_each(records.fields) AS f "
+                "WHERE table_name = ? AND view = ? GROUP BY f.key ORDER BY COUNT(*) DESC, f.key LIMIT 1",
+                (table, view),
+            ).fetchone()
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM records WHERE table_name = ? AND view = ?", (table, view)
+            ).fetchone()
+        return (row[0] if row else None), (key[0] if key else None), count
+
+    def records(self, table, view=None):
+        view = view or ''
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, created_time, fields FROM records WHERE table_name = ? AND view = ? ORDER BY position",
+                (table, view),
+            ).fetchall()
+        return [{'id': rid, 'createdTime': created, 'fields': json.loads(fields)} for rid, created, fields in rows]
+
+    def sync(self, client, table, view=None):
+        """Bring one table up to date and return its records in view order."""
+        view_key = view or ''
+        started = datetime.utcnow()
+        cursor, id_field, count = self._cursor(table, view_key)
+
+        # An incremental sync costs one request more than a full read, so it only pays off past one page
+        full = not (cursor and id_field and count > PAGE_SIZE)
+        try:
+            if not full:
+                try:
+                    formula = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{cursor}'))"
+                    changed = client.fetch_pages(table, view, params={'filterByFormula': formula})
+                    # Any existing field works for an ID-only listing; records come back with `id` regardless
+                    listing = client.fetch_pages(table, view, params={'fields[]': id_field})
+                except AirtableError as e:
+                    # e.g. the ID field was renamed or deleted in Airtable since the last sync
+                    print(f"⚠️ Incremental sync failed ({e}), re-reading '{table}' in full")
+                    full = True
+            if full:
+                changed = listing = client.fetch_pages(table, view)
+        except AirtableError as e:
+            print(f"❌ Error syncing {e} — serving the last replicated copy")
+            return self.records(table, view)
+
+        ids = [rec['id'] for rec in listing]
+        with self._lock, self._connect() as conn:
+            if full:
+                conn.execute("DELETE FROM records WHERE table_name = ? AND view = ?", (table, view_key))
+            conn.executemany(
+                "INSERT OR REPLACE INTO records (table_name, view, id, created_time, fields) VALUES (?, ?, ?, ?, ?)",
+                [(table, view_key, rec['id'], rec.get('createdTime'), json.dumps(rec.get('fields', {})))
+                 for rec in changed],
+            )
+            existing = {r[0] for r in conn.execute(
+                "SELECT id FROM records WHERE table_name = ? AND view = ?", (table, view_key))}
+            deleted = existing - set(ids)
+            conn.executemany(
+                "DELETE FROM records WHERE table_name = ? AND view = ? AND id = ?",
+                [(table, view_key, rid) for rid in deleted],
+            )
+            conn.executemany(
+                "UPDATE records SET position = ? WHERE table_name = ? AND view = ? AND id = ?",
+                [(pos, table, view_key, rid) for pos, rid in enumerate(ids)],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO cursors (table_name, view, synced_at) VALUES (?, ?, ?)",
+                (table, view_key, (started - CURSOR_OVERLAP).strftime('%Y-%m-%dT%H:%M:%S.000Z')),
+            )
+
+        mode = "full" if full else "incremental"
+        print(f"🔄 Synced '{table}' ({mode}): {len(changed)} changed, {len(deleted)} deleted, {len(ids)} total")
+        return self.records(table, view)
@@ -0,0 +1,96 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # repo root
+from run_metrics import current_run  # noqa: E402
+
+# Columns stamped with the export time; they never count as a data change
+TIMESTAMP_COLUMNS = {'Last Updated', 'Export Timestamp', 'Timestamp'}
+
+MANIFEST_PATH = 'export_manifest.json'
+
+_manifest_lock = threading.Lock()
+
+
+def fingerprint_csv(text):
+    """SHA-256 of the CSV data rows, ignoring timestamp columns and column order."""
+    reader = csv.reader(io.StringIO(text, newline=''))
+    header = next(reader, [])
+    keep = sorted(
+        (name, i) for i, name in enumerate(header) if name not in TIMESTAMP_COLUMNS
+    )
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([name for name, _ in keep]).encode('utf-8'))
+    for row in reader:
+        values = [row[i] if i < len(row) else '' for _, i in keep]
+        digest.update(b'\n' + json.dumps(values, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def fingerprint_file(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return fingerprint_csv(f.read())
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def write_if_changed(output_file, text, manifest_path=MANIFEST_PATH):
+    """Write `text` to `output_file` unless its data matches what is already there.
+
+    Returns True when the file was written. The manifest records the
+    fingerprint of every export, so a rerun with the same Airtable data
+    leaves the CSV (and its old timestamps) untouched.
+    """
+    fingerprint = fingerprint_csv(text)
+    with _manifest_lock:
+        manifest = load_manifest(manifest_path)
+        previous = manifest.get(output_file, {}).get('fingerprint')
+        if previous is None and os.path.exists(output_file):
+            previous = fingerprint_file(output_file)
+
+        if previous == fingerprint and os.path.exists(output_file):
+            print(f"💤 No data changes in {output_file}, keeping existing file")
+            current_run().count('exports_unchanged')
+            if output_file not in manifest:
+                manifest[output_file] = {'fingerprint': fingerprint, 'updated': None}
+                save_manifest(manifest, manifest_path)
+            return False
+
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            f.write(text)
+        manifest[output_file] = {
+            'fingerprint': fingerprint,
+            'updated': datetime.utcnow().isoformat(),
+        }
+        save_manifest(manifest, manifest_path)
+        current_run().count('exports_written')
+        current_run().count('export_bytes_written', len(text.encode('utf-8')))
+        return True
+
+
+@contextmanager
+def open_export(output_file, manifest_path=MANIFEST_PATH):
+    """Drop-in for open(output_file, 'w'): buffers the CSV and writes it only if the data changed."""
+    buffer = io.StringIO(newline='')
+    yield buffer
+    write_if_changed(output_file, buffer.getvalue(), manifest_path)
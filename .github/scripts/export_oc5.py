@@ -1,12 +1,10 @@
-import requests
-import csv
-import os
-from urllib.parse import quote
 from datetime import datetime
 
-# Airtable credentials and config
-AIRTABLE_TOKEN = os.environ['AIRTABLE_TOKEN']
-BASE_ID = 'app0Ljjhrp3lTTpTO'
+from airtable_client import AirtableClient
+from export_manifest import open_export
+from linked_records import records_frame, resolve_linked_fields
+
+# Airtable config
 MAIN_TABLE = 'OC5 Connections' 
 VIEW_NAME = 'Grid view'
 
@@ -22,77 +20,34 @@ DISPLAY_FIELDS = {
     'Workstream': 'Workstream',
 }
 
-headers = {"Authorization": f"Bearer {AIRTABLE_TOKEN}"}
-
-# Fetch all records from an Airtable table
-def fetch_all_records(table, view=None):
-    url = f"https://api.airtable.com/v0/{BASE_ID}/{quote(table)}"
-    if view:
-        url += f"?view={quote(view)}"
-    all_records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-        response = requests.get(url, headers=headers, params=params).json()
-
-        if 'records' not in response:
-            print(f"❌ Error fetching {table}:", response)
-            break
-
-        all_records.extend(response['records'])
-        offset = response.get('offset')
-        if not offset:
-            break
-
-    print(f"✅ Fetched {len(all_records)} records from '{table}'")
-    return all_records
-
-# Step 1: Build lookup maps for linked fields
-linked_id_maps = {}
-for field, table_name in LINKED_TABLES.items():
-    records = fetch_all_records(table_name)
-    display_field = DISPLAY_FIELDS[field]
-    id_to_display = {
-        rec['id']: rec['fields'].get(display_field, 'Unknown')
-        for rec in records
-    }
-    linked_id_maps[field] = id_to_display
-
-# Step 2: Fetch main OC5 records
-main_records = fetch_all_records(MAIN_TABLE, view=VIEW_NAME)
-print(f"🔍 Retrieved {len(main_records)} records from {MAIN_TABLE}")
-
-# Step 3: Enrich records with readable names and timestamp
-timestamp = datetime.utcnow().isoformat()
-for record in main_records:
-    fields = record['fields']
-    for field_name in LINKED_TABLES.keys():
-        linked_ids = fields.get(field_name, [])
-        if isinstance(linked_ids, list):
-            readable_names = [linked_id_maps[field_name].get(id, 'Unknown') for id in linked_ids]
-            fields[f"{field_name} (Name)"] = ", ".join(readable_names)
-    fields['Last Updated'] = timestamp  # Force change for GitHub push
-
-# Step 4: Export to CSV
-output_file = 'OC5.csv'
-with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-    if main_records:
-        fieldnames = [
-            'Connection',
-            'Indicator ID',
-            'Economy (Name)',
-            'Workstream (Name)',
-            'Last Updated'
-        ]
-
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for rec in main_records:
-            row = rec['fields']
-            filtered_row = {key: row.get(key, '') for key in fieldnames}
-            writer.writerow(filtered_row)
-
-print(f"✅ Export complete: {output_file}")
+def export(client):
+    # Step 1: Build lookup maps for linked fields
+    linked_id_maps = client.lookup_maps(LINKED_TABLES, DISPLAY_FIELDS)
+
+    # Step 2: Fetch main OC5 records
+    main_records = client.sync_records(MAIN_TABLE, view=VIEW_NAME)
+    print(f"🔍 Retrieved {len(main_records)} records from {MAIN_TABLE}")
+
+    # Step 3: Enrich records with readable names and timestamp
+    df = records_frame(main_records)
+    resolve_linked_fields(df, linked_id_maps)
+    df['Last Updated'] = datetime.utcnow().isoformat()
+
+    # Step 4: Export to CSV
+    output_file = 'OC5.csv'
+    with open_export(output_file) as csvfile:
+        if main_records:
+            fieldnames = [
+                'Connection',
+                'Indicator ID',
+                'Economy (Name)',
+                'Workstream (Name)',
+                'Last Updated'
+            ]
+
+            df.reindex(columns=fieldnames).to_csv(csvfile, index=False)
+
+    print(f"✅ Export complete: {output_file}")
+
+if __name__ == "__main__":
+    export(AirtableClient.from_env())
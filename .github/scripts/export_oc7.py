@@ -1,12 +1,10 @@
-import requests
-import csv
-import os
-from urllib.parse import quote
 from datetime import datetime
 
-# Airtable credentials and config
-AIRTABLE_TOKEN = os.environ['AIRTABLE_TOKEN']
-BASE_ID = 'app0Ljjhrp3lTTpTO'
+from airtable_client import AirtableClient
+from export_manifest import open_export
+from linked_records import records_frame, resolve_linked_fields
+
+# Airtable config
 MAIN_TABLE = 'OC7 Barriers Resolved'
 VIEW_NAME = 'Grid view'
 
@@ -21,78 +19,36 @@ DISPLAY_FIELDS = {
     'Workstream': 'Workstream'
 }
 
-headers = {"Authorization": f"Bearer {AIRTABLE_TOKEN}"}
-
-# Helper: fetch all records from a table
-def fetch_all_records(table, view=None):
-    url = f"https://api.airtable.com/v0/{BASE_ID}/{quote(table)}"
-    if view:
-        url += f"?view={quote(view)}"
-    all_records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-        response = requests.get(url, headers=headers, params=params).json()
-
-        if 'records' not in response:
-            print(f"❌ Error fetching {table}:", response)
-            break
-
-        all_records.extend(response['records'])
-        offset = response.get('offset')
-        if not offset:
-            break
-
-    return all_records
-
-# Step 1: Build lookup maps for linked fields
-linked_id_maps = {}
-for field, table in LINKED_TABLES.items():
-    records = fetch_all_records(table)
-    display_field = DISPLAY_FIELDS[field]
-    id_to_display = {
-        rec['id']: rec['fields'].get(display_field, 'Unknown')
-        for rec in records
-    }
-    linked_id_maps[field] = id_to_display
+def export(client):
+    # Step 1: Build lookup maps for linked fields
+    linked_id_maps = client.lookup_maps(LINKED_TABLES, DISPLAY_FIELDS)
 
-# Step 2: Fetch main OC7 records
-main_records = fetch_all_records(MAIN_TABLE, view=VIEW_NAME)
+    # Step 2: Fetch main OC7 records
+    main_records = client.sync_records(MAIN_TABLE, view=VIEW_NAME)
 
-# Step 3: Resolve linked record IDs to readable names
-for record in main_records:
-    fields = record['fields']
-    for field_name in LINKED_TABLES.keys():
-        linked_ids = fields.get(field_name, [])
-        if isinstance(linked_ids, list):
-            readable_names = [linked_id_maps[field_name].get(id, 'Unknown') for id in linked_ids]
-            fields[f"{field_name} (Name)"] = ", ".join(readable_names)
+    # Step 3: Resolve linked record IDs to readable names
+    df = records_frame(main_records)
+    resolve_linked_fields(df, linked_id_maps)
 
-# Step 4: Export to CSV with selected fields only
-output_file = 'OC7.csv'
-desired_fields = [
-    'Barrier',
-    'Economy (Name)',
-    'Workstream (Name)',
-    'Indicator ID',
-    'Barrier Type',
-    'Adaptive Action Type',
-    'Fiscal Year',
-    'Export Timestamp' 
-]
+    # Step 4: Export to CSV with selected fields only
+    output_file = 'OC7.csv'
+    desired_fields = [
+        'Barrier',
+        'Economy (Name)',
+        'Workstream (Name)',
+        'Indicator ID',
+        'Barrier Type',
+        'Adaptive Action Type',
+        'Fiscal Year',
+        'Export Timestamp' 
+    ]
 
-timestamp = datetime.utcnow().isoformat()
+    df['Export Timestamp'] = datetime.utcnow().isoformat()
 
-with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-    writer = csv.DictWriter(csvfile, fieldnames=desired_fields)
-    writer.writeheader()
-    for rec in main_records:
-        row = {field: rec['fields'].get(field, '') for field in desired_fields if field != 'Export Timestamp'}
-        row['Export Timestamp'] = timestamp
-        writer.writerow(row)
+    with open_export(output_file) as csvfile:
+        df.reindex(columns=desired_fields).to_csv(csvfile, index=False)
 
-print(f"✅ Export complete: {output_file}")
+    print(f"✅ Export complete: {output_file}")
 
+if __name__ == "__main__":
+    export(AirtableClient.from_env())
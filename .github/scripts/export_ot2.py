@@ -1,13 +1,10 @@
-import requests
-import csv
-import os
-import pandas as pd
-from urllib.parse import quote
 from datetime import datetime
 
-# Airtable credentials and config
-AIRTABLE_TOKEN = os.environ['AIRTABLE_TOKEN']
-BASE_ID = 'app0Ljjhrp3lTTpTO'
+from airtable_client import AirtableClient
+from export_manifest import open_export
+from linked_records import explode_linked, field_values, id_lists, records_frame, resolve_linked_fields
+
+# Airtable config
 MAIN_TABLE = 'OT2 Private Sector Engagements'
 VIEW_NAME = 'Grid view'
 
@@ -27,109 +24,55 @@ DISPLAY_FIELDS = {
     'Amount': 'Amount'
 }
 
-headers = {"Authorization": f"Bearer {AIRTABLE_TOKEN}"}
-
-# Helper: fetch all records from a table
-def fetch_all_records(table, view=None):
-    url = f"https://api.airtable.com/v0/{BASE_ID}/{quote(table)}"
-    if view:
-        url += f"?view={quote(view)}"
-    all_records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-        response = requests.get(url, headers=headers, params=params).json()
-
-        if 'records' not in response:
-            print(f"❌ Error fetching {table}:", response)
-            break
-
-        all_records.extend(response['records'])
-        offset = response.get('offset')
-        if not offset:
-            break
-
-    return all_records
-
-# Step 1: Fetch linked records and build lookup maps
-linked_id_maps = {}
-for field, table_name in LINKED_TABLES.items():
-    records = fetch_all_records(table_name)
-    display_field = DISPLAY_FIELDS[field]
-    id_to_display = {
-        rec['id']: rec['fields'].get(display_field, 'Unknown')
-        for rec in records
-    }
-    linked_id_maps[field] = id_to_display
-
-# Step 2: Fetch main OT2 records
-main_records = fetch_all_records(MAIN_TABLE, view=VIEW_NAME)
-
-# Step 3: Resolve linked field IDs to display names
-for record in main_records:
-    fields = record['fields']
-    for field_name in LINKED_TABLES.keys():
-        linked_ids = fields.get(field_name, [])
-        if isinstance(linked_ids, list):
-            readable_names = [linked_id_maps[field_name].get(id, 'Unknown') for id in linked_ids]
-            fields[f"{field_name} (Name)"] = ", ".join(readable_names)
-
-# Step 4: Write intermediate clean file (only readable fields)
-output_file_clean = 'OT2_clean.csv'
-filtered_records = []
-
-# Select fields to keep
-desired_fields = [
-    'Firm (Name)',
-    'Indicator ID',
-    'Workstream (Name)',
-    'Economy (Name)',
-    'Engagement',
-    'Fiscal Year',
-    'U.S. FAOs Addressed',
-    'PSE Modality',
-    'Resource (Amount)'
-]
-
-for rec in main_records:
-    fields = rec['fields']
-    clean_row = {k: fields.get(k, '') for k in desired_fields}
-    filtered_records.append(clean_row)
-
-with open(output_file_clean, 'w', newline='', encoding='utf-8') as csvfile:
-    writer = csv.DictWriter(csvfile, fieldnames=desired_fields)
-    writer.writeheader()
-    for row in filtered_records:
-        writer.writerow(row)
-
-print("✅ Clean file created: OT2_clean.csv")
-
-# Step 5: Final cleanup and explode multi-value fields
-df = pd.read_csv(output_file_clean)
-
-# Clean FAO field (remove brackets/quotes)
-df['U.S. FAOs Addressed'] = df['U.S. FAOs Addressed'].astype(str).str.replace(r"[\[\]']", "", regex=True)
-
-# Split all multi-value fields into lists
-df = df.assign(**{
-    'Firm (Name)': df['Firm (Name)'].astype(str).str.split(','),
-    'U.S. FAOs Addressed': df['U.S. FAOs Addressed'].astype(str).str.split(',')
-})
-
-# Explode each to long format
-df = df.explode('Workstream (Name)').explode('Firm (Name)').explode('U.S. FAOs Addressed')
-
-# Strip whitespace
-df['Firm (Name)'] = df['Firm (Name)'].str.strip()
-df['U.S. FAOs Addressed'] = df['U.S. FAOs Addressed'].str.strip()
-
-# ✅ Add timestamp to ensure file always changes
-df['Export Timestamp'] = datetime.utcnow().isoformat()
-
-# Final export
-df.to_csv('OT2.csv', index=False)
-print("✅ Final exploded and cleaned file created: OT2.csv")
-
+def export(client):
+    # Step 1: Fetch linked records and build lookup maps
+    linked_id_maps = client.lookup_maps(LINKED_TABLES, DISPLAY_FIELDS)
+
+    # Step 2: Fetch main OT2 records
+    main_records = client.sync_records(MAIN_TABLE, view=VIEW_NAME)
+
+    # Step 3: Resolve linked field IDs to display names
+    df = records_frame(main_records)
+    resolve_linked_fields(df, linked_id_maps)
+
+    # Step 4: Write intermediate clean file (only readable fields)
+    output_file_clean = 'OT2_clean.csv'
+
+    # Select fields to keep
+    desired_fields = [
+        'Firm (Name)',
+        'Indicator ID',
+        'Workstream (Name)',
+        'Economy (Name)',
+        'Engagement',
+        'Fiscal Year',
+        'U.S. FAOs Addressed',
+        'PSE Modality',
+        'Resource (Amount)'
+    ]
+
+    with open_export(output_file_clean) as csvfile:
+        df.reindex(columns=desired_fields).to_csv(csvfile, index=False)
+
+    print("✅ Clean file created: OT2_clean.csv")
+
+    # Step 5: Explode multi-value fields to long format (one row per firm × FAO)
+    long_df = df.reindex(columns=desired_fields)
+    long_df['Firm (Name)'] = explode_linked(
+        id_lists(field_values(df, 'Firm')), linked_id_maps['Firm'], empty=None
+    ).groupby(level=0).agg(list)
+    long_df['U.S. FAOs Addressed'] = field_values(df, 'U.S. FAOs Addressed').map(
+        lambda v: v if isinstance(v, list) else [part.strip() for part in v.split(',')] if isinstance(v, str) else None
+    )
+    long_df = long_df.explode('Firm (Name)').explode('U.S. FAOs Addressed')
+
+    # ✅ Add export timestamp (ignored by the data fingerprint)
+    long_df['Export Timestamp'] = datetime.utcnow().isoformat()
+
+    # Final export
+    with open_export('OT2.csv') as csvfile:
+        long_df.to_csv(csvfile, index=False)
+    print("✅ Final exploded and cleaned file created: OT2.csv")
+
+if __name__ == "__main__":
+    export(AirtableClient.from_env())
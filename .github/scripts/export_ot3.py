@@ -1,11 +1,9 @@
-import requests
-import csv
-import os
-from urllib.parse import quote
 
-# Airtable credentials and config
-AIRTABLE_TOKEN = os.environ['AIRTABLE_TOKEN']
-BASE_ID = 'app0Ljjhrp3lTTpTO'
+from airtable_client import AirtableClient
+from export_manifest import open_export
+from linked_records import records_frame, resolve_linked_fields
+
+# Airtable config
 MAIN_TABLE = 'OT3 RISE Mentions'
 VIEW_NAME = 'Grid view'
 
@@ -21,69 +19,24 @@ DISPLAY_FIELDS = {
     'Economy': 'Economy'
 }
 
-headers = {"Authorization": f"Bearer {AIRTABLE_TOKEN}"}
-
-# Helper: fetch all records from a table
-def fetch_all_records(table, view=None):
-    url = f"https://api.airtable.com/v0/{BASE_ID}/{quote(table)}"
-    if view:
-        url += f"?view={quote(view)}"
-    all_records = []
-    offset = None
-
-    while True:
-        params = {}
-        if offset:
-            params['offset'] = offset
-        response = requests.get(url, headers=headers, params=params).json()
-
-        if 'records' not in response:
-            print(f"❌ Error fetching {table}:", response)
-            break
-
-        all_records.extend(response['records'])
-        offset = response.get('offset')
-        if not offset:
-            break
-
-    return all_records
-
-# Step 1: Build lookup maps for linked fields
-linked_id_maps = {}
-for field, table in LINKED_TABLES.items():
-    records = fetch_all_records(table)
-    display_field = DISPLAY_FIELDS[field]
-    id_to_display = {
-        rec['id']: rec['fields'].get(display_field, 'Unknown')
-        for rec in records
-    }
-    linked_id_maps[field] = id_to_display
-
-# Step 2: Fetch OT3 records
-main_records = fetch_all_records(MAIN_TABLE, view=VIEW_NAME)
+def export(client):
+    # Step 1: Build lookup maps for linked fields
+    linked_id_maps = client.lookup_maps(LINKED_TABLES, DISPLAY_FIELDS)
 
-# Step 3: Resolve linked record IDs to display names
-for record in main_records:
-    fields = record['fields']
-    for field_name in LINKED_TABLES.keys():
-        linked_ids = fields.get(field_name, [])
-        if isinstance(linked_ids, list):
-            readable_names = [linked_id_maps[field_name].get(id, 'Unknown') for id in linked_ids]
-            fields[f"{field_name} (Name)"] = ", ".join(readable_names)
+    # Step 2: Fetch OT3 records
+    main_records = client.sync_records(MAIN_TABLE, view=VIEW_NAME)
 
-# Step 4: Export to CSV
-output_file = 'OT3.csv'
-with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-    if main_records:
-        all_fieldnames = set()
-        for rec in main_records:
-            all_fieldnames.update(rec['fields'].keys())
-        fieldnames = list(all_fieldnames)
+    # Step 3: Resolve linked record IDs to display names
+    df = records_frame(main_records)
+    resolve_linked_fields(df, linked_id_maps)
 
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for rec in main_records:
-            writer.writerow(rec['fields'])
+    # Step 4: Export to CSV
+    output_file = 'OT3.csv'
+    with open_export(output_file) as csvfile:
+        if main_records:
+            df.to_csv(csvfile, index=False)
 
-print(f"✅ Export complete: {output_file}")
+    print(f"✅ Export complete: {output_file}")
 
+if __name__ == "__main__":
+    export(AirtableClient.from_env())
@@ -0,0 +1,94 @@
+import argparse
+import importlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from airtable_client import AirtableClient
+from run_metrics import PROFILE_STAGE, current_run, start_run
+
+# Every export module, in the order the workflow used to run them
+EXPORTS = [
+    'export_ot1',
+    'export_ot2',
+    'export_ot3',
+    'export_ot4',
+    'export_ot5',
+    'export_oc1',
+    'export_oc2',
+    'export_oc3',
+    'export_oc4',
+    'export_oc5',
+    'export_oc6',
+    'export_oc7',
+    'export_KPI_Targets',
+    'export_Workshop_Master_List',
+    'export_Feedback_Form_Data',
+    'export_Stakeholder_Reference_List',
+]
+
+# Requests are throttled by the client, so a few workers are enough to keep it busy
+MAX_WORKERS = 4
+
+
+def resolve(names):
+    """Accept 'ot1', 'export_ot1' or 'export_ot1.py'; no names means every export."""
+    if not names:
+        return list(EXPORTS)
+    resolved = []
+    for name in names:
+        module = name[:-3] if name.endswith('.py') else name
+        if not module.startswith('export_'):
+            module = f'export_{module}'
+        if module not in EXPORTS:
+            raise SystemExit(f"❌ Unknown export: {name}")
+        resolved.append(module)
+    return resolved
+
+
+def run_one(module_name, client):
+    start = time.perf_counter()
+    try:
+        with current_run().stage(module_name):
+            importlib.import_module(module_name).export(client)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {'export': module_name, 'seconds': round(time.perf_counter() - start, 2), 'error': error}
+
+
+def run_exports(module_names, client, max_workers=MAX_WORKERS):
+    """Run the exports concurrently on one shared client; returns one result per export."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda name: run_one(name, client), module_names))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Airtable KPI exports in parallel.")
+    parser.add_argument('exports', nargs='*', help="exports to run, e.g. ot1 oc4 (default: all)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="drop cached Airtable responses before running")
+    parser.add_argument('--profile', default=PROFILE_STAGE, metavar='STAGE',
+                        help="cProfile one export, e.g. export_ot4 (default: $PROFILE_STAGE)")
+    args = parser.parse_args(argv)
+
+    with start_run('exports', profile_stage=args.profile) as run:
+        client = AirtableClient.from_env()
+        if args.clear_cache and client.cache:
+            client.cache.clear()
+            print("🧹 Cleared the Airtable response cache")
+        results = run_exports(resolve(args.exports), client, max_workers=args.workers)
+        run.count('exports_failed', sum(1 for r in results if r['error']))
+
+    print("\n📋 Export summary")
+    for r in results:
+        status = f"❌ {r['error']}" if r['error'] else "✅"
+        print(f"  {r['export']:<36} {r['seconds']:>6.2f}s  {status}")
+
+    failed = [r for r in results if r['error']]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import pandas as pd
+
+UNKNOWN = 'Unknown'
+
+
+def records_frame(records):
+    """One row per Airtable record and one column per field, values kept as Python objects."""
+    return pd.DataFrame([rec.get('fields', {}) for rec in records], dtype=object)
+
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and pd.isna(value))
+
+
+def field_values(df, field):
+    """A field's column, or an all-missing column when no record has the field."""
+    if field in df:
+        return df[field]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def first_present(df, fields, default=UNKNOWN):
+    """Per row, the first of `fields` with a truthy value (like `a or b or default`)."""
+    result = pd.Series([None] * len(df), index=df.index, dtype=object)
+    for field in fields:
+        values = field_values(df, field)
+        truthy = values.map(lambda v: not is_missing(v) and bool(v)).astype(bool)
+        result = result.where(result.notna(), values.where(truthy))
+    return result.where(result.notna(), default)
+
+
+def id_lists(values, wrap_strings=False, other=None):
+    """Normalize a linked field to lists of record IDs.
+
+    A missing field becomes []; a bare string ID becomes [id] when
+    `wrap_strings` is set; any other value becomes `other` (None: not a
+    linked value, leave the row unresolved).
+    """
+    def normalize(value):
+        if isinstance(value, list):
+            return value
+        if isinstance(value, str) and wrap_strings:
+            return [value]
+        if is_missing(value):
+            return []
+        return other
+
+    return values.map(normalize).astype(object)
+
+
+def explode_linked(lists, id_map, missing=UNKNOWN, empty=UNKNOWN):
+    """Long format: one entry per (row, linked record), indexed by row.
+
+    Each distinct ID is looked up once and the result is mapped over the
+    exploded column. IDs not in `id_map` become `missing` (dropped when
+    None); rows left without any name get `empty` (dropped when None).
+    """
+    exploded = lists.explode().dropna()
+    names = {record_id: id_map.get(record_id, missing) for record_id in exploded.unique()}
+    resolved = exploded.map(names).dropna()
+    if empty is None:
+        return resolved
+    without = lists.index.difference(resolved.index)
+    filler = pd.Series([empty] * len(without), index=without, dtype=object)
+    return pd.concat([resolved, filler]).sort_index(kind='stable')
+
+
+def join_linked(lists, id_map, sep=', ', missing=UNKNOWN, empty=''):
+    """Linked ID lists → joined display names; rows whose value is None stay NaN."""
+    present = lists.dropna()
+    resolved = explode_linked(present, id_map, missing=missing, empty=None)
+    joined = resolved.astype(str).groupby(level=0).agg(sep.join)
+    return joined.reindex(present.index, fill_value=empty).reindex(lists.index)
+
+
+def resolve_linked_fields(df, linked_id_maps, fields=None, wrap_strings=False, **options):
+    """Add a '<field> (Name)' column for each linked field, resolved against its lookup map.
+
+    `options` go to join_linked (sep, missing, empty).
+    """
+    for field in fields or linked_id_maps:
+        lists = id_lists(field_values(df, field), wrap_strings=wrap_strings)
+        df[f"{field} (Name)"] = join_linked(lists, linked_id_maps[field], **options)
+    return df
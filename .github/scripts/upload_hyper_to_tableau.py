@@ -1,12 +1,28 @@
 import os
+import argparse
+import csv
 import glob
-import pandas as pd
+import hashlib
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from itertools import islice
+from urllib.parse import urlsplit
 from tableauhyperapi import (
     HyperProcess, Telemetry, Connection, TableDefinition,
-    SqlType, Inserter, CreateMode, TableName
+    SqlType, Inserter, CreateMode, TableName, SchemaName, HyperException,
+    escape_name, escape_string_literal
 )
 import tableauserverclient as TSC
 
+from export_manifest import fingerprint_file, load_manifest, save_manifest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # repo root
+from run_metrics import current_run, start_run  # noqa: E402
+
 # ── CONFIG ──────────────────────────────────────────────
 PAT_NAME       = os.environ["TABLEAU_PAT_NAME"]
 PAT_SECRET     = os.environ["TABLEAU_PAT_SECRET"]
@@ -14,6 +30,19 @@ SITE_NAME      = os.environ["TABLEAU_SITE_NAME"]
 PROJECT_ID     = os.environ["TABLEAU_PROJECT_ID"]
 TABLEAU_SERVER = os.environ["TABLEAU_REST_URL"]
 
+# Fingerprints of the last successful publish per CSV (kept across runs by actions/cache)
+PUBLISH_MANIFEST_PATH = os.environ.get("PUBLISH_MANIFEST_PATH", ".cache/tableau_publish_manifest.json")
+
+# Conversions share one Hyper process; uploads are network-bound and overlap with them
+CONVERT_WORKERS = 2
+PUBLISH_WORKERS = 4
+
+# Optional single-extract mode: every CSV becomes a table of one .hyper, published once
+SINGLE_EXTRACT = os.environ.get("TABLEAU_SINGLE_EXTRACT", "").lower() in ("1", "true", "yes")
+SINGLE_EXTRACT_NAME = "US APEC-RISE KPI Extract"
+SINGLE_EXTRACT_PATH = "kpi_extract.hyper"
+KPI_TABLE_NAME = "KPI Actual vs Target"
+
 # Optional: Workbooks to refresh after publish
 WORKBOOKS_TO_REFRESH = [
     "US APEC-RISE Dashboard"
@@ -39,33 +68,291 @@ EXTRACT_NAME_MAP = {
     "Stakeholder_Reference_List.csv": "Stakeholder Reference List"
 }
 
+# How each indicator's actual is measured in the KPI table. Indicators not
+# listed (Percent indicators, OT1 person hours, which the sign-in export has no
+# hours for) are left NULL rather than guessed from the number of records.
+ACTUAL_MEASURES = {
+    "OC1": 'COUNT(*)',                        # one record per reform
+    "OT2": 'COUNT(DISTINCT "Engagement")',
+    "OT3": 'COUNT(*)',                        # one record per mention
+    "OT4": 'COUNT(DISTINCT "Firm (Name)")',
+    "OC5": 'COUNT(*)',                        # one record per connection
+    "OC6": 'COUNT(DISTINCT "Name")',
+    "OT5": 'SUM("Amount")',
+}
+
 # ── CONVERT CSV TO HYPER ───────────────────────────────
-def convert_csv_to_hyper(csv_path: str, hyper_path: str):
-    df = pd.read_csv(csv_path)
-
-    def map_dtype(dtype):
-        if pd.api.types.is_integer_dtype(dtype):
-            return SqlType.int()
-        elif pd.api.types.is_float_dtype(dtype):
-            return SqlType.double()
-        else:
-            return SqlType.text()
+SAMPLE_ROWS = 1000      # rows read to guess column types
+INSERT_BATCH = 10_000   # rows per Inserter batch when COPY is not possible
+
+INT_RE = re.compile(r"[+-]?\d+")
+FLOAT_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+INT32_MAX = 2**31 - 1
+INT64_MAX = 2**63 - 1
+
+# Widening order: a column takes the widest type any of its values needs
+TYPE_ORDER = ["int", "big_int", "double", "text"]
+
+
+def value_type(value):
+    if INT_RE.fullmatch(value):
+        n = abs(int(value))
+        return "int" if n <= INT32_MAX else "big_int" if n <= INT64_MAX else "double"
+    if FLOAT_RE.fullmatch(value):
+        return "double"
+    return "text"
+
+
+def infer_column_types(csv_path, max_rows=None):
+    """Column name → type name, from the first `max_rows` rows (all rows if None).
+
+    Empty cells are NULLs and don't influence the type; a column that is
+    empty throughout the scan is text.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"{csv_path} has no header row")
+        seen = [None] * len(header)
+        for row in islice(reader, max_rows):
+            for i, value in enumerate(row[:len(header)]):
+                if value == "" or seen[i] == "text":
+                    continue
+                kind = value_type(value)
+                if seen[i] is None or TYPE_ORDER.index(kind) > TYPE_ORDER.index(seen[i]):
+                    seen[i] = kind
+    return {name: kind or "text" for name, kind in zip(header, seen)}
+
+
+def table_definition(column_types, table_name=TableName("Extract")):
+    table_def = TableDefinition(table_name=table_name)
+    for name, kind in column_types.items():
+        table_def.add_column(name, getattr(SqlType, kind)())
+    return table_def
+
+
+def copy_csv(conn, table_def, csv_path):
+    """Bulk-load with Hyper's own CSV reader; empty cells become NULL."""
+    return conn.execute_command(
+        f"COPY {table_def.table_name} FROM {escape_string_literal(os.path.abspath(csv_path))} "
+        f"WITH (format csv, header, delimiter ',', NULL '', encoding 'utf-8')"
+    )
+
+
+def insert_csv(conn, table_def, column_types, csv_path):
+    """Fallback: stream parsed rows through an Inserter in bounded batches."""
+    casts = [
+        int if kind in ("int", "big_int") else float if kind == "double" else str
+        for kind in column_types.values()
+    ]
+    width = len(casts)
+    count = 0
+    with open(csv_path, newline="", encoding="utf-8") as f, Inserter(conn, table_def) as inserter:
+        reader = csv.reader(f)
+        next(reader, None)
+        while True:
+            batch = list(islice(reader, INSERT_BATCH))
+            if not batch:
+                break
+            inserter.add_rows(
+                [None if v == "" else cast(v) for cast, v in zip(casts, row + [""] * (width - len(row)))]
+                for row in batch
+            )
+            count += len(batch)
+        inserter.execute()
+    return count
+
+
+def start_hyper():
+    return HyperProcess(telemetry=Telemetry.SEND_USAGE_DATA_TO_TABLEAU)
+
+
+def load_csv_table(conn, csv_path, table_name=TableName("Extract")):
+    """Create `table_name` from a CSV and return the number of rows loaded.
+
+    Types come from a sample of rows. If a later row contradicts the sample,
+    the COPY fails and the types are re-inferred from the whole file. If
+    Hyper's CSV reader still rejects the file, rows are inserted in batches.
+    """
+    column_types = infer_column_types(csv_path, max_rows=SAMPLE_ROWS)
 
-    table_def = TableDefinition(table_name=TableName("Extract"))
-    for col in df.columns:
-        sql_type = map_dtype(df[col].dtype)
-        table_def.add_column(col, sql_type)
-        if sql_type == SqlType.text():
-            df[col] = df[col].astype(str).fillna("")
+    for attempt in ("sample", "full scan"):
+        table_def = table_definition(column_types, table_name)
+        conn.catalog.create_table(table_def)
+        try:
+            return copy_csv(conn, table_def, csv_path)
+        except HyperException as e:
+            print(f"⚠️ COPY with {attempt} types failed for {csv_path}: {str(e).splitlines()[0]}")
+            conn.execute_command(f"DROP TABLE {table_def.table_name}")
+            if attempt == "sample":
+                column_types = infer_column_types(csv_path)
 
-    with HyperProcess(telemetry=Telemetry.SEND_USAGE_DATA_TO_TABLEAU) as hyper:
+    table_def = table_definition(column_types, table_name)
+    conn.catalog.create_table(table_def)
+    return insert_csv(conn, table_def, column_types, csv_path)
+
+
+def convert_csv_to_hyper(csv_path: str, hyper_path: str, hyper=None):
+    """Convert one CSV to a single-table .hyper file without loading it into memory.
+
+    Pass a running HyperProcess to reuse it; otherwise one is started.
+    """
+    with (nullcontext(hyper) if hyper is not None else start_hyper()) as hyper:
         with Connection(endpoint=hyper.endpoint, database=hyper_path, create_mode=CreateMode.CREATE_AND_REPLACE) as conn:
-            conn.catalog.create_table(table_def)
-            with Inserter(conn, table_def) as inserter:
-                inserter.add_rows(rows=df.itertuples(index=False, name=None))
-                inserter.execute()
+            count = load_csv_table(conn, csv_path)
+
+    print(f"📦 Created {hyper_path} ({count} rows, {os.path.getsize(hyper_path)} bytes)")
+
+
+def parse_target(value):
+    """'50,000' → 50000.0, '60%' → 60.0, 'US$1,500,000' → 1500000.0; None if no number."""
+    match = re.search(r"\d+(\.\d+)?", (value or "").replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def build_kpi_table(conn, schema, loaded):
+    """Join each indicator's actual (from its own table) to its row in KPI_Targets.csv."""
+    with open("KPI_Targets.csv", newline="", encoding="utf-8") as f:
+        targets = list(csv.DictReader(f))
+
+    table_def = TableDefinition(TableName(schema, KPI_TABLE_NAME))
+    for name in ("Indicator ID", "Name", "Type", "Unit", "Target"):
+        table_def.add_column(name, SqlType.text())
+    for name in ("Target Value", "Records", "Actual", "Progress"):
+        table_def.add_column(name, SqlType.double())
+    conn.catalog.create_table(table_def)
+
+    rows = []
+    for target in targets:
+        indicator = target.get("Indicator ID", "")
+        csv_file = f"{indicator}.csv"
+        records = actual = None
+        if csv_file in loaded:
+            table = TableName(schema, EXTRACT_NAME_MAP[csv_file])
+            records = conn.execute_scalar_query(f"SELECT COUNT(*) FROM {table}")
+            measure = ACTUAL_MEASURES.get(indicator)
+            if measure and target.get("Unit") != "Percent":
+                try:
+                    actual = conn.execute_scalar_query(f"SELECT {measure} FROM {table}")
+                except HyperException as e:
+                    print(f"⚠️ Could not compute actual for {indicator}: {str(e).splitlines()[0]}")
+        target_value = parse_target(target.get("Target"))
+        progress = actual / target_value if actual is not None and target_value else None
+        rows.append([
+            indicator, target.get("Name"), target.get("Type"), target.get("Unit"), target.get("Target"),
+            target_value,
+            None if records is None else float(records),
+            None if actual is None else float(actual),
+            progress,
+        ])
+
+    with Inserter(conn, table_def) as inserter:
+        inserter.add_rows(rows)
+        inserter.execute()
+    return len(rows)
+
+
+def build_single_extract(csv_files, hyper_path, hyper):
+    """Write every CSV as its own table of one .hyper file, plus the KPI actual-vs-target table."""
+    schema = "Extract"
+    with Connection(endpoint=hyper.endpoint, database=hyper_path, create_mode=CreateMode.CREATE_AND_REPLACE) as conn:
+        conn.catalog.create_schema(SchemaName(schema))
+        loaded = []
+        for csv_file in csv_files:
+            count = load_csv_table(conn, csv_file, TableName(schema, EXTRACT_NAME_MAP[csv_file]))
+            print(f"📥 Loaded {csv_file} → {escape_name(EXTRACT_NAME_MAP[csv_file])} ({count} rows)")
+            loaded.append(csv_file)
+        if "KPI_Targets.csv" in loaded:
+            count = build_kpi_table(conn, schema, loaded)
+            print(f"🎯 Built {escape_name(KPI_TABLE_NAME)} ({count} indicators)")
+
+    print(f"📦 Created {hyper_path} ({len(loaded)} tables, {os.path.getsize(hyper_path)} bytes)")
 
-    print(f"📦 Created {hyper_path} ({os.path.getsize(hyper_path)} bytes)")
+
+def combined_fingerprint(fingerprints):
+    return hashlib.sha256(json.dumps(fingerprints, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ── PUBLISH EXTRACT ────────────────────────────────────
+def publish_extract(server, hyper_path, extract_name):
+    print(f"📤 Publishing '{hyper_path}' as '{extract_name}' into project ID {PROJECT_ID}")
+    ds_item = TSC.DatasourceItem(project_id=PROJECT_ID, name=extract_name)
+    ds_item.connection_credentials = None
+
+    published_ds = server.datasources.publish(
+        ds_item,
+        hyper_path,
+        mode=TSC.Server.PublishMode.Overwrite
+    )
+    current_run().record_http(urlsplit(TABLEAU_SERVER).netloc, nbytes=os.path.getsize(hyper_path))
+
+    print(f"✅ Overwrote extract: '{extract_name}' (Datasource ID: {published_ds.id})")
+    return published_ds.id
+
+
+def timed(stage, func, *args):
+    """Run `func` as a named stage of the run report; returns (seconds, result)."""
+    start = time.perf_counter()
+    with current_run().stage(stage):
+        result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def convert_and_publish(server, hyper, changed, published):
+    """Convert changed CSVs on a worker pool and publish each as soon as it is ready.
+
+    `changed` maps CSV file → data fingerprint. Every successful publish is
+    recorded in `published` (and saved) right away, so a failure later in
+    the run doesn't cause the finished datasets to be republished.
+    Returns per-dataset timings and errors.
+    """
+    timings = {csv_file: {"convert": None, "publish": None, "error": None} for csv_file in changed}
+
+    with ThreadPoolExecutor(CONVERT_WORKERS) as convert_pool, ThreadPoolExecutor(PUBLISH_WORKERS) as publish_pool:
+        conversions = {}
+        for csv_file in changed:
+            hyper_path = f"{os.path.splitext(csv_file)[0]}.hyper"
+            print(f"🔄 Converting {csv_file} → {hyper_path}")
+            conversions[convert_pool.submit(timed, f"convert:{csv_file}", convert_csv_to_hyper, csv_file, hyper_path, hyper)] = (csv_file, hyper_path)
+
+        uploads = {}
+        for future in as_completed(conversions):
+            csv_file, hyper_path = conversions[future]
+            try:
+                timings[csv_file]["convert"], _ = future.result()
+            except Exception as e:
+                print(f"❌ Failed to convert {csv_file}: {e}")
+                timings[csv_file]["error"] = f"convert: {e}"
+                continue
+            upload = publish_pool.submit(timed, f"publish:{csv_file}", publish_extract, server, hyper_path, EXTRACT_NAME_MAP[csv_file])
+            uploads[upload] = csv_file
+
+        for future in as_completed(uploads):
+            csv_file = uploads[future]
+            try:
+                timings[csv_file]["publish"], datasource_id = future.result()
+            except Exception as e:
+                print(f"❌ Failed to publish {csv_file}: {e}")
+                timings[csv_file]["error"] = f"publish: {e}"
+                continue
+            published[csv_file] = {"fingerprint": changed[csv_file], "datasource_id": datasource_id}
+            save_manifest(published, PUBLISH_MANIFEST_PATH)
+
+    return timings
+
+
+def print_timings(timings, refresh_timings):
+    def fmt(seconds):
+        return f"{seconds:7.2f}s" if seconds is not None else "      —"
+
+    print("\n⏱️ Timing breakdown")
+    print(f"  {'Dataset':<32} {'convert':>8} {'publish':>8}")
+    for csv_file, t in timings.items():
+        status = f"  ❌ {t['error']}" if t["error"] else ""
+        print(f"  {csv_file:<32} {fmt(t['convert'])} {fmt(t['publish'])}{status}")
+    for wb_name, seconds in refresh_timings.items():
+        print(f"  refresh '{wb_name}': {fmt(seconds).strip()}")
 
 # ── TRIGGER WORKBOOK REFRESH ───────────────────────────
 def trigger_workbook_refresh(server, workbook_name):
@@ -86,42 +373,89 @@ def trigger_workbook_refresh(server, workbook_name):
         print(f"❌ Failed to refresh workbook '{workbook.name}': {e}")
 
 # ── MAIN EXECUTION ─────────────────────────────────────
-def main():
+def publish_single_extract(server, fingerprints, published):
+    """Single-extract mode: rebuild and publish the combined .hyper if any CSV changed."""
+    fingerprint = combined_fingerprint(fingerprints)
+    if published.get(SINGLE_EXTRACT_PATH, {}).get("fingerprint") == fingerprint:
+        print("✅ No extract data changed; nothing to publish.")
+        return None
+
+    timings = {SINGLE_EXTRACT_PATH: {"convert": None, "publish": None, "error": None}}
+    with start_hyper() as hyper:
+        timings[SINGLE_EXTRACT_PATH]["convert"], _ = timed(
+            "convert:single_extract", build_single_extract, sorted(fingerprints), SINGLE_EXTRACT_PATH, hyper
+        )
+    timings[SINGLE_EXTRACT_PATH]["publish"], datasource_id = timed(
+        "publish:single_extract", publish_extract, server, SINGLE_EXTRACT_PATH, SINGLE_EXTRACT_NAME
+    )
+    published[SINGLE_EXTRACT_PATH] = {"fingerprint": fingerprint, "datasource_id": datasource_id}
+    save_manifest(published, PUBLISH_MANIFEST_PATH)
+    return timings
+
+
+def upload(args):
+    """Publish every CSV whose data changed since the last successful publish."""
     csv_files = glob.glob("*.csv")
     print("🗂️ Found CSVs:", csv_files)
 
-    auth = TSC.PersonalAccessTokenAuth(PAT_NAME, PAT_SECRET, SITE_NAME)
-    server = TSC.Server(TABLEAU_SERVER, use_server_version=True)
-
-    with server.auth.sign_in(auth):
+    published = load_manifest(PUBLISH_MANIFEST_PATH)
+    fingerprints = {}
+    with current_run().stage("fingerprint"):
         for csv_file in csv_files:
             if csv_file not in EXTRACT_NAME_MAP:
                 print(f"⚠️ Skipping unrecognized file: {csv_file}")
                 continue
+            fingerprints[csv_file] = fingerprint_file(csv_file)
 
-            extract_name = EXTRACT_NAME_MAP[csv_file]
-            hyper_path = f"{os.path.splitext(csv_file)[0]}.hyper"
+    changed = {}
+    for csv_file, fingerprint in fingerprints.items():
+        if published.get(csv_file, {}).get("fingerprint") == fingerprint:
+            print(f"💤 {csv_file} unchanged since last publish, skipping")
+            continue
+        changed[csv_file] = fingerprint
+    current_run().count("datasets_changed", len(changed))
+    current_run().count("datasets_unchanged", len(fingerprints) - len(changed))
 
-            print(f"🔄 Converting {csv_file} → {hyper_path}")
-            convert_csv_to_hyper(csv_file, hyper_path)
-
-            print(f"📤 Publishing '{hyper_path}' as '{extract_name}' into project ID {PROJECT_ID}")
-            ds_item = TSC.DatasourceItem(project_id=PROJECT_ID, name=extract_name)
-            ds_item.connection_credentials = None
+    if not changed and not args.single_extract:
+        print("✅ No extract data changed; nothing to publish.")
+        return
 
-            published_ds = server.datasources.publish(
-                ds_item,
-                hyper_path,
-                mode=TSC.Server.PublishMode.Overwrite
-            )
+    auth = TSC.PersonalAccessTokenAuth(PAT_NAME, PAT_SECRET, SITE_NAME)
+    server = TSC.Server(TABLEAU_SERVER, use_server_version=True)
 
-            print(f"✅ Overwrote extract: '{extract_name}' (Datasource ID: {published_ds.id})")
+    refresh_timings = {}
+    with server.auth.sign_in(auth):
+        if args.single_extract:
+            timings = publish_single_extract(server, fingerprints, published)
+            if timings is None:
+                return
+        else:
+            with start_hyper() as hyper:
+                timings = convert_and_publish(server, hyper, changed, published)
 
         # Refresh workbooks if configured
-        for wb_name in WORKBOOKS_TO_REFRESH:
-            trigger_workbook_refresh(server, wb_name)
+        if any(t["publish"] is not None for t in timings.values()):
+            for wb_name in WORKBOOKS_TO_REFRESH:
+                refresh_timings[wb_name], _ = timed(f"refresh:{wb_name}", trigger_workbook_refresh, server, wb_name)
+
+    print_timings(timings, refresh_timings)
+
+    failed = [csv_file for csv_file, t in timings.items() if t["error"]]
+    if failed:
+        raise SystemExit(f"❌ {len(failed)} dataset(s) failed: {', '.join(failed)}")
 
     print("✅ Finished uploading extracts and refreshing workbooks.")
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the KPI CSVs to Hyper and publish them to Tableau.")
+    parser.add_argument("--single-extract", action="store_true", default=SINGLE_EXTRACT,
+                        help="publish one multi-table extract instead of one datasource per CSV "
+                             "(also TABLEAU_SINGLE_EXTRACT=1)")
+    args = parser.parse_args(argv)
+
+    with start_run("upload_hyper"):
+        upload(args)
+
 if __name__ == "__main__":
     main()
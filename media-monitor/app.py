@@ -1,6 +1,11 @@
+import math
+
+import numpy as np
 import streamlit as st
-import pandas as pd
-import json
+
+from article_snapshot import articles_to_frame, read_snapshot
+from article_store import ArticleStore
+from filter_index import FilterIndex
 
 # === Page config ===
 st.set_page_config(
@@ -15,14 +20,18 @@ st.markdown(
 )
 
 # === Loader with 24h TTL ===
-@st.cache_data(ttl=24 * 3600)
+# Prefer the Parquet snapshot published by the pipeline; fall back to the JSON store.
+# cache_resource hands back the same objects on every rerun instead of a copy;
+# nothing below mutates them.
+@st.cache_resource(ttl=24 * 3600)
 def load_articles():
-    with open("data/processed_articles.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+    df = read_snapshot()
+    if df is None:
+        df = articles_to_frame(ArticleStore().load())
+    return df, FilterIndex(df)
 
 # === Load and process ===
-articles = load_articles()
-df = pd.DataFrame(articles)
+df, filter_index = load_articles()
 
 if df.empty:
     st.warning("No articles found. Please check the update script or data file.")
@@ -48,41 +57,78 @@ all_source_types = [
     "Multilateral",
     "Private Sector"
 ]
+sort_options = {
+    "Newest first": ("timestamp", False),
+    "Oldest first": ("timestamp", True),
+    "Title (A–Z)": ("title", True),
+    "Economy (A–Z)": ("economy", True),
+}
 
 # === Sidebar Filters ===
 st.sidebar.header("🔍 Filter Articles")
 
-economies = sorted(df["economy"].dropna().unique())
-sentiments = sorted(df["sentiment"].dropna().unique())
+economies = filter_index.values("economy")
+sentiments = filter_index.values("sentiment")
 
 selected_economy = st.sidebar.selectbox("🌐 Economy", ["All"] + economies)
 selected_workstream = st.sidebar.selectbox("🧩 Workstream", ["All"] + all_workstreams)
 selected_sentiment = st.sidebar.selectbox("📈 Sentiment", ["All"] + sentiments)
 selected_source = st.sidebar.selectbox("🏛 Source Type", ["All"] + all_source_types)
 
-# === Apply Filters ===
-filtered = df.copy()
-if selected_economy != "All":
-    filtered = filtered[filtered["economy"] == selected_economy]
-if selected_workstream != "All":
-    filtered = filtered[filtered["workstreams"].str.contains(selected_workstream)]
-if selected_sentiment != "All":
-    filtered = filtered[filtered["sentiment"] == selected_sentiment]
-if selected_source != "All":
-    filtered = filtered[filtered["source_type"] == selected_source]
+# === Apply Filters (bitset intersection over the cached indexes) ===
+rows = filter_index.select(
+    economy=selected_economy,
+    workstreams=selected_workstream,
+    sentiment=selected_sentiment,
+    source_type=selected_source,
+)
+
+# === Sort & paginate: only the visible page is rendered ===
+st.sidebar.header("📄 Display")
+selected_sort = st.sidebar.selectbox("↕️ Sort by", list(sort_options))
+page_size = st.sidebar.selectbox("📑 Articles per page", [10, 25, 50, 100], index=1)
+
+sort_col, ascending = sort_options[selected_sort]
+rows = filter_index.ordered(rows, sort_col, ascending)
+n_pages = max(1, math.ceil(len(rows) / page_size))
 
-st.markdown(f"### 📰 Showing {len(filtered)} Article(s)")
+def request_jump():
+    st.session_state["jump_pending"] = True
+
+if sort_col == "timestamp":
+    jump_date = st.sidebar.date_input("📅 Jump to date", value=None, key="jump_date", on_change=request_jump)
+    if st.session_state.pop("jump_pending", False) and jump_date is not None:
+        # First article on or before (newest first) / on or after (oldest first) the chosen date
+        days = df["timestamp"].to_numpy(dtype="U10")[rows]
+        target = jump_date.isoformat()
+        hits = np.flatnonzero(days >= target if ascending else days <= target)
+        position = hits[0] if len(hits) else max(len(rows) - 1, 0)
+        st.session_state["page"] = position // page_size + 1
+
+if st.session_state.get("page", 1) > n_pages:
+    st.session_state["page"] = 1
+page = st.sidebar.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key="page")
+
+start = (page - 1) * page_size
+page_rows = rows[start:start + page_size]
+filtered = df.iloc[page_rows]
+
+st.markdown(f"### 📰 Showing {len(rows)} Article(s)")
+if len(rows):
+    st.caption(f"Articles {start + 1}–{start + len(page_rows)} • page {page} of {n_pages}")
 
 # === Display Articles ===
-for _, row in filtered.iterrows():
+for row in filtered.itertuples(index=False):
     with st.container():
-        st.markdown(f"**[{row['title']}]({row['link']})**")
+        st.markdown(f"**[{row.title}]({row.link})**")
         st.markdown(
-            f"_{row['published']} • {row['economy']} • {row['source_type']} • Sentiment: `{row['sentiment']}`_"
+            f"_{row.published} • {row.economy} • {row.source_type} • Sentiment: `{row.sentiment}`_"
         )
-        st.markdown(row['summary'][:400] + "...")
+        st.markdown(row.summary[:400] + "...")
+        sources = getattr(row, "sources", None)  # set when syndicated copies were folded into this story
+        if isinstance(sources, (list, np.ndarray)) and len(sources) > 1:
+            st.caption(f"Also reported by: {', '.join(sources[1:])}")
         st.markdown(
-            f"`Workstreams:` {row['workstreams']} | `Aligned with U.S.:` {row['aligned_with_us']}"
+            f"`Workstreams:` {row.workstreams} | `Aligned with U.S.:` {row.aligned_with_us}"
         )
         st.divider()
-
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+
+SNAPSHOT_PATH = "data/articles.parquet"
+
+# Low-cardinality columns stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = ["economy", "economies", "sentiment", "source_type", "workstreams"]
+
+SNAPSHOT_COLUMNS = [
+    "title", "link", "published", "summary", "source", "source_type",
+    "sentiment", "economy", "economies", "workstreams", "aligned_with_us", "timestamp",
+]
+
+
+def articles_to_frame(articles):
+    """Typed DataFrame of the snapshot columns, newest first. Accepts records or a DataFrame."""
+    df = pd.DataFrame(articles)
+    for col in SNAPSHOT_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    extra = [c for c in df.columns if c not in SNAPSHOT_COLUMNS]
+    df = df[SNAPSHOT_COLUMNS + extra]
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].fillna("Unknown").astype("category")
+    if not df.empty:
+        df = df.sort_values("timestamp", ascending=False, kind="stable").reset_index(drop=True)
+    return df
+
+
+def write_snapshot(articles, path=SNAPSHOT_PATH):
+    """Publish the columnar snapshot read by the dashboard. Needs pyarrow."""
+    df = articles_to_frame(articles)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def update_snapshot(new_articles, store, path=SNAPSHOT_PATH):
+    """Fold new or updated articles into the existing snapshot.
+
+    The whole store is loaded only to build a snapshot that is missing or
+    unreadable. Without pyarrow this raises ImportError before anything is
+    loaded; callers skip the snapshot.
+    """
+    import pyarrow.parquet as pq
+
+    existing = None
+    if os.path.exists(path):
+        try:
+            existing = pq.read_table(path, memory_map=True).to_pandas()
+        except (OSError, ValueError) as e:  # ArrowInvalid is a ValueError
+            print(f"⚠️ Snapshot {path} is unreadable ({e}), rebuilding it")
+    if existing is None:
+        return write_snapshot(store.load(), path)
+    if not new_articles:
+        return len(existing)
+    for col in CATEGORICAL_COLUMNS:
+        if col in existing:  # snapshots written before a column was added lack it
+            existing[col] = existing[col].astype(object)
+    merged = pd.concat([existing, pd.DataFrame(new_articles)], ignore_index=True)
+    merged = merged.drop_duplicates(subset="link", keep="last")
+    return write_snapshot(merged, path)
+
+
+def read_snapshot(path=SNAPSHOT_PATH, columns=None):
+    """Load the snapshot memory-mapped; returns None if it is missing or pyarrow is unavailable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+
+ARTICLES_DIR = "data/articles"
+LEGACY_PATH = "data/processed_articles.json"
+COMPACT_EVERY = 30  # appends between compactions (roughly monthly for the daily job)
+
+
+class ArticleStore:
+    """Append-only article archive stored as monthly JSON Lines segments.
+
+    Each article lands in `<root>/<YYYY-MM>.jsonl` according to its
+    `timestamp`, and its link is appended to `<root>/links.txt`, so a run
+    only writes the new records. Writing a record whose link already exists
+    acts as an update: readers return the latest line for each link, and
+    compaction drops the superseded ones.
+    """
+
+    def __init__(self, root=ARTICLES_DIR, legacy_path=LEGACY_PATH):
+        self.root = root
+        self.legacy_path = legacy_path
+        self.links_path = os.path.join(root, "links.txt")
+        self.manifest_path = os.path.join(root, "manifest.json")
+
+    # === Segments ===
+    def segments(self):
+        if not os.path.isdir(self.root):
+            return []
+        names = sorted(n for n in os.listdir(self.root) if n.endswith(".jsonl"))
+        return [os.path.join(self.root, n) for n in names]
+
+    def _segment_path(self, article):
+        month = (article.get("timestamp") or "")[:7] or "undated"
+        return os.path.join(self.root, f"{month}.jsonl")
+
+    @staticmethod
+    def _read_segment(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _read_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"appends_since_compaction": 0, "dirty_segments": []}
+
+    def _write_manifest(self, manifest):
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    # === Writes ===
+    def append(self, articles):
+        """Append articles to their month segments. Cost is O(len(articles))."""
+        if not articles:
+            return 0
+        os.makedirs(self.root, exist_ok=True)
+
+        by_segment = {}
+        for article in articles:
+            by_segment.setdefault(self._segment_path(article), []).append(article)
+
+        for path, batch in by_segment.items():
+            with open(path, "a", encoding="utf-8") as f:
+                for article in batch:
+                    f.write(json.dumps(article, ensure_ascii=False) + "\n")
+
+        with open(self.links_path, "a", encoding="utf-8") as f:
+            for article in articles:
+                f.write(article["link"] + "\n")
+
+        manifest = self._read_manifest()
+        manifest["appends_since_compaction"] += 1
+        dirty = set(manifest["dirty_segments"]) | {os.path.basename(p) for p in by_segment}
+        manifest["dirty_segments"] = sorted(dirty)
+        self._write_manifest(manifest)
+        return len(articles)
+
+    def migrate_legacy(self):
+        """One-off import of the old single-file archive. Returns the number of articles imported."""
+        if self.segments() or not os.path.exists(self.legacy_path):
+            return 0
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        # Oldest first so each segment is written in timestamp order
+        legacy.sort(key=lambda a: a.get("timestamp", ""))
+        self.append(legacy)
+        self.compact()
+        os.remove(self.legacy_path)
+        return len(legacy)
+
+    def compact(self, force_all=False):
+        """Rewrite dirty segments sorted by timestamp with superseded records dropped."""
+        manifest = self._read_manifest()
+        names = [os.path.basename(p) for p in self.segments()] if force_all else manifest["dirty_segments"]
+
+        for name in names:
+            path = os.path.join(self.root, name)
+            if not os.path.exists(path):
+                continue
+            latest = {}
+            for article in self._read_segment(path):
+                latest[article["link"]] = article  # later lines win
+            records = sorted(latest.values(), key=lambda a: a.get("timestamp", ""))
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for article in records:
+                    f.write(json.dumps(article, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, path)
+
+        if force_all:
+            # Repeated links from updates are harmless in the index, so it is only rebuilt on a full pass
+            links = [a["link"] for a in self.iter_articles(newest_first=False)]
+            with open(self.links_path, "w", encoding="utf-8") as f:
+                f.writelines(link + "\n" for link in links)
+
+        self._write_manifest({"appends_since_compaction": 0, "dirty_segments": []})
+        return len(names)
+
+    def maybe_compact(self, every=COMPACT_EVERY):
+        if self._read_manifest()["appends_since_compaction"] >= every:
+            return self.compact()
+        return 0
+
+    # === Reads ===
+    def links(self):
+        """Every stored link, read from the plain-text index rather than the segments."""
+        if os.path.exists(self.links_path):
+            with open(self.links_path, "r", encoding="utf-8") as f:
+                return {line.rstrip("\n") for line in f if line.strip()}
+        return {a["link"] for a in self.iter_articles()}
+
+    def iter_articles(self, since=None, newest_first=True):
+        """Yield articles (latest version per link), optionally only those with timestamp > since.
+
+        Segments older than the month of `since` are never opened. With
+        `newest_first`, articles come in descending timestamp order (a
+        re-appended article keeps its original timestamp, so it is sorted
+        back into place); otherwise in append order.
+        """
+        segments = self.segments()
+        if not segments:
+            yield from self._iter_legacy(since, newest_first)
+            return
+
+        if since:
+            segments = [p for p in segments if os.path.basename(p)[:7] >= since[:7]]
+
+        seen = set()
+        for path in (reversed(segments) if newest_first else segments):
+            records = self._read_segment(path)
+            if newest_first:
+                # Latest line per link (not yet yielded from a newer segment), then by timestamp
+                latest = []
+                for article in reversed(records):
+                    if article["link"] not in seen:
+                        seen.add(article["link"])
+                        latest.append(article)
+                records = sorted(latest, key=lambda a: a.get("timestamp", ""), reverse=True)
+            else:
+                # Keep only the last line per link while still yielding in file order
+                last_index = {a["link"]: i for i, a in enumerate(records)}
+                records = [a for i, a in enumerate(records) if last_index[a["link"]] == i]
+            for article in records:
+                if since and article.get("timestamp", "") <= since:
+                    continue
+                yield article
+
+    def _iter_legacy(self, since, newest_first):
+        if not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        legacy.sort(key=lambda a: a.get("timestamp", ""), reverse=newest_first)
+        for article in legacy:
+            if since and article.get("timestamp", "") <= since:
+                continue
+            yield article
+
+    def load(self, since=None, newest_first=True):
+        return list(self.iter_articles(since=since, newest_first=newest_first))
+
+
+if __name__ == "__main__":
+    # Manual maintenance: `python media-monitor/article_store.py compact`
+    if sys.argv[1:] == ["compact"]:
+        store = ArticleStore()
+        print(f"🧹 Compacted {store.compact(force_all=True)} segment(s) in {store.root}")
+    else:
+        print("Usage: python media-monitor/article_store.py compact")
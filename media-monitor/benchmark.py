@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from article_snapshot import update_snapshot
+from article_store import ArticleStore
+from dedupe import DuplicateIndex, url_key
+from generate_signals import SIGNAL_COLUMNS, article_totals, assumption_keywords, classify_article
+from sentiment import SentimentScorer
+from signal_matcher import SignalMatcher
+from update_articles import APEC_ECONOMIES, WORKSTREAM_KEYWORDS, build_article
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root
+from run_metrics import peak_rss_mb  # noqa: E402
+
+# === Benchmark Setup ===
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Share of synthetic articles that mention each kind of term (roughly what the live feeds show)
+ECONOMY_RATE = 0.7
+WORKSTREAM_RATE = 0.4
+SIGNAL_RATE = 0.25
+DUPLICATE_RATE = 0.1  # links already in the store or repeated within the batch
+SYNDICATED_RATE = 0.1  # earlier stories republished under another outlet's link
+
+SOURCES = [
+    "https://thediplomat.com", "https://www.apec.org", "https://www.channelnewsasia.com",
+    "https://www.bangkokpost.com", "https://www.reuters.com", "https://www.trade.gov",
+]
+
+FILLER = (
+    "the a of to in and for on with at by from as officials said week government ministers "
+    "talks new plan regional leaders market growth policy report year announced meeting "
+    "economy sector agency data analysts expected summit national support local industry "
+    "program forum deal global development council review today investors partners"
+).split()
+
+
+# === Synthetic Corpus ===
+def synthetic_entries(n, seed=0):
+    """`n` feed entries shaped like feedparser output, with realistic term densities."""
+    rng = random.Random(seed)
+    economy_terms = APEC_ECONOMIES
+    workstream_terms = [k for keywords in WORKSTREAM_KEYWORDS.values() for k in keywords]
+    signal_terms = [
+        k for polarities in assumption_keywords.values() for keywords in polarities.values() for k in keywords
+    ]
+    start = datetime(2025, 1, 1)
+    n_unique = max(1, int(n * (1 - DUPLICATE_RATE)))
+
+    entries = []
+    for i in range(n):
+        # Duplicates reuse the link of an earlier entry
+        link_id = i if i < n_unique else rng.randrange(n_unique)
+        if entries and rng.random() < SYNDICATED_RATE:
+            story = rng.choice(entries)
+            entries.append(dict(story, link=f"{rng.choice(SOURCES)}/wire/{i}"))
+            continue
+        words = rng.choices(FILLER, k=rng.randint(40, 70))
+        if rng.random() < ECONOMY_RATE:
+            for _ in range(rng.choice([1, 1, 1, 2])):
+                words.insert(rng.randrange(len(words)), rng.choice(economy_terms))
+        if rng.random() < WORKSTREAM_RATE:
+            words.insert(rng.randrange(len(words)), rng.choice(workstream_terms))
+        if rng.random() < SIGNAL_RATE:
+            words.insert(rng.randrange(len(words)), rng.choice(signal_terms))
+        published = start + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        entries.append({
+            "title": " ".join(words[:10]).capitalize(),
+            "summary": " ".join(words[10:]) + ".",
+            "link": f"{rng.choice(SOURCES)}/news/{link_id}",
+            "published": published.strftime("%a, %d %b %Y %H:%M:%S +0000"),
+            "_timestamp": published.isoformat(),
+        })
+    return entries
+
+
+# === Pipeline Stages ===
+def run_pipeline(n, workdir, seed=0):
+    """Time each stage of ingest → signals for a corpus of `n` articles."""
+    entries = synthetic_entries(n, seed)
+    store = ArticleStore(root=os.path.join(workdir, "articles"), legacy_path=os.path.join(workdir, "legacy.json"))
+    # The store already holds a slice of the corpus, as it would after earlier runs
+    store.append([dict(build_article(e), timestamp=e["_timestamp"]) for e in entries[: max(1, n // 20)]])
+
+    stages = {}
+
+    def timed(name, func, items=None):
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        rss_after = peak_rss_mb()
+        items = len(result) if items is None else items
+        stages[name] = {
+            "seconds": round(seconds, 4),
+            "items": items,
+            "per_second": round(items / seconds, 1) if seconds > 0 else None,
+            "peak_rss_mb_so_far": rss_after,
+            "rss_growth_mb": round(rss_after - rss_before, 1) if rss_after is not None else None,
+        }
+        return result
+
+    def dedupe():
+        seen = {url_key(link) for link in store.links()}
+        index = DuplicateIndex()
+        index.add(store.load(newest_first=False))
+        fresh = []
+        for entry in entries:
+            key = url_key(entry["link"])
+            if key not in seen:
+                seen.add(key)
+                fresh.append(entry)
+        fresh, _ = index.merge(fresh)
+        return fresh
+
+    fresh = timed("dedupe", dedupe, items=len(entries))
+
+    def tag():
+        articles = [build_article(e) for e in fresh]
+        for article, entry in zip(articles, fresh):
+            article["timestamp"] = entry["_timestamp"]  # spread over a year of monthly segments
+        return articles
+
+    articles = timed("tag", tag)
+
+    def sentiment():
+        scores = SentimentScorer().score_batch([f"{a['title']} {a['summary']}" for a in articles])
+        for article, (label, score) in zip(articles, scores):
+            article["sentiment"] = label
+            article["polarity"] = round(score, 4)
+
+    timed("sentiment", sentiment, items=len(articles))
+
+    def signal():
+        matcher = SignalMatcher(assumption_keywords)
+        return [s for row in articles for s in classify_article(row, matcher)]
+
+    signals = timed("signal", signal, items=len(articles))
+
+    def write():
+        store.append(articles)
+        pd.DataFrame(signals, columns=SIGNAL_COLUMNS).to_csv(os.path.join(workdir, "risk_signals.csv"), index=False)
+        article_totals(articles).to_csv(os.path.join(workdir, "signal_totals.csv"), index=False)
+        try:
+            update_snapshot(articles, store, os.path.join(workdir, "articles.parquet"))
+        except ImportError:
+            pass  # no pyarrow: the snapshot is skipped in production too
+
+    timed("write", write, items=len(articles))
+
+    timed("load", store.load)
+
+    return {
+        "articles": n,
+        "new_articles": len(articles),
+        "signal_rows": len(signals),
+        "stages": stages,
+        "total_seconds": round(sum(s["seconds"] for s in stages.values()), 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "children_peak_rss_mb": peak_rss_mb(children=True),
+    }
+
+
+def run_size(n, seed):
+    """Run one corpus size in a fresh interpreter, so peak RSS is not shared between sizes."""
+    workdir = tempfile.mkdtemp(prefix=f"mm-bench-{n}-")
+    result_path = os.path.join(workdir, "result.json")
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", str(n), "--seed", str(seed),
+             "--workdir", workdir, "--result", result_path],
+            check=True,
+        )
+        with open(result_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def regressions(report, baseline, tolerance):
+    """Stages whose throughput dropped by more than `tolerance` against a previous report."""
+    previous = {run["articles"]: run for run in baseline.get("runs", [])}
+    found = []
+    for run in report["runs"]:
+        before = previous.get(run["articles"])
+        if not before:
+            continue
+        for stage, stats in run["stages"].items():
+            old = before["stages"].get(stage, {}).get("per_second")
+            new = stats.get("per_second")
+            if old and new and new < old * (1 - tolerance):
+                found.append(f"{run['articles']} articles / {stage}: {new:.0f}/s vs {old:.0f}/s")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the media ingest → signal pipeline on synthetic corpora.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="corpus sizes to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="previous JSON report to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop vs the baseline")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        result = run_pipeline(args.child, args.workdir, args.seed)
+        with open(args.result, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return 0
+
+    runs = []
+    for n in args.sizes:
+        print(f"⏱️ Benchmarking {n:,} articles...", file=sys.stderr)
+        run = run_size(n, args.seed)
+        summary = ", ".join(f"{stage} {stats['seconds']:.2f}s" for stage, stats in run["stages"].items())
+        print(f"   {summary} | peak RSS {run['peak_rss_mb']} MB", file=sys.stderr)
+        runs.append(run)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"✅ Benchmark report saved to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"❌ Regression: {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import re
+from itertools import chain
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+
+# === URL Canonicalization ===
+# Query parameters added by newsletters, social sites and ad platforms
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "cmpid", "ocid", "smid"}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def query_params(query):
+    """Raw `name=value` pairs of a query string minus tracking parameters, encoding untouched."""
+    return [p for p in query.split("&") if p and not is_tracking_param(p.split("=", 1)[0])]
+
+
+def clean_url(url):
+    """`url` without tracking parameters or fragment; safe to store and link to."""
+    parts = urlsplit((url or "").strip())
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "&".join(query_params(parts.query)), ""))
+
+
+def url_key(url):
+    """Comparison key for a link: clean_url plus scheme, `www.`, host case and trailing slash ignored."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    query = "&".join(sorted(query_params(parts.query)))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+# === Near-Duplicate Detection ===
+SHINGLE_SIZE = 3       # words per shingle
+NUM_PERM = 64          # MinHash signature length
+BANDS = 16             # LSH bands of NUM_PERM // BANDS rows; candidates share at least one band
+SIMILARITY = 0.5       # Jaccard similarity of shingle sets that makes two articles the same story
+MIN_SHINGLES = 5       # shorter texts only match on identical shingle sets
+CHUNK = 1000           # articles hashed per numpy batch
+
+WORD_RE = re.compile(r"\w+")
+LOW_32_BITS = np.uint64(0xFFFFFFFF)
+SHIFT = np.uint64(32)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Hashes of the overlapping `size`-word shingles of `text`.
+
+    The index is rebuilt every run, so the per-process salt of hash() doesn't matter.
+    """
+    words = WORD_RE.findall((text or "").lower())
+    if len(words) < size:
+        return {hash(tuple(words))} if words else set()
+    return set(map(hash, zip(*(words[i:] for i in range(size)))))
+
+
+def article_text(article):
+    return f"{article.get('title', '')} {article.get('summary', '')}"
+
+
+class MinHasher:
+    """MinHash signatures from NUM_PERM multiply-shift hash functions, vectorized with numpy.
+
+    Each function is (a*x + b) mod 2**64 >> 32 for a random odd `a`, which
+    needs no division, unlike the textbook (a*x + b) mod p.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+
+    def signatures(self, shingle_sets):
+        """One signature row per shingle set; rows of empty sets are left zero."""
+        result = np.zeros((len(shingle_sets), len(self.a)), dtype=np.uint64)
+        rows = [i for i, s in enumerate(shingle_sets) if s]
+        for start in range(0, len(rows), CHUNK):
+            chunk = rows[start:start + CHUNK]
+            lengths = [len(shingle_sets[i]) for i in chunk]
+            flat = np.fromiter(
+                chain.from_iterable(shingle_sets[i] for i in chunk), dtype=np.int64, count=sum(lengths)
+            ).view(np.uint64) & LOW_32_BITS
+            permuted = (self.a * flat + self.b) >> SHIFT  # uint64 arithmetic wraps mod 2**64
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            result[chunk] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return result
+
+
+class DuplicateIndex:
+    """LSH index of article shingles for clustering syndicated copies of a story.
+
+    Each article's MinHash signature is cut into BANDS bands, and a band is
+    a hash bucket key. A new article is compared only with articles that
+    share a bucket, so a lookup costs about the same whether the index holds
+    a hundred articles or a hundred thousand. Candidates are confirmed with the
+    exact Jaccard similarity of their shingle sets.
+    """
+
+    def __init__(self, similarity=SIMILARITY, bands=BANDS, hasher=None):
+        self.similarity = similarity
+        self.bands = bands
+        self.hasher = hasher or MinHasher()
+        # Folds the rows of a band into one bucket key
+        rows = len(self.hasher.a) // bands
+        self.band_weights = np.random.default_rng(2).integers(1, 1 << 63, size=rows, dtype=np.uint64)
+        self.buckets = {}    # (band, band hash) -> [article index]
+        self.articles = []
+        self.shingle_sets = []
+
+    def _prepare(self, articles):
+        """(shingle set, band keys) per article, hashed in numpy batches."""
+        if not articles:
+            return []
+        shingle_sets = [shingles(article_text(a)) for a in articles]
+        signatures = self.hasher.signatures(shingle_sets)
+        band_hashes = (signatures.reshape(len(articles), self.bands, -1) * self.band_weights).sum(axis=2)
+        return [
+            (s, list(enumerate(h)) if s else [])
+            for s, h in zip(shingle_sets, band_hashes.tolist())
+        ]
+
+    def _find(self, shingle_set, keys):
+        seen = set()
+        for key in keys:
+            for i in self.buckets.get(key, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                other = self.shingle_sets[i]
+                if len(shingle_set) < MIN_SHINGLES or len(other) < MIN_SHINGLES:
+                    same = shingle_set == other
+                else:
+                    same = len(shingle_set & other) / len(shingle_set | other) >= self.similarity
+                if same:
+                    return self.articles[i]
+        return None
+
+    def _add(self, article, shingle_set, keys):
+        i = len(self.articles)
+        self.articles.append(article)
+        self.shingle_sets.append(shingle_set)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(i)
+
+    def add(self, articles):
+        """Index stored articles as possible representatives, without clustering them."""
+        for article, (shingle_set, keys) in zip(articles, self._prepare(articles)):
+            self._add(article, shingle_set, keys)
+
+    def merge(self, articles):
+        """Cluster `articles` against the index and each other.
+
+        Returns (fresh, updated): the articles that start a new story, and the
+        already-indexed representatives that gained a duplicate. Every
+        duplicate is folded into its representative's `sources` and
+        `duplicate_links` instead of being kept.
+        """
+        fresh, updated, fresh_ids = [], {}, set()
+        for article, (shingle_set, keys) in zip(articles, self._prepare(articles)):
+            representative = self._find(shingle_set, keys)
+            if representative is None:
+                self._add(article, shingle_set, keys)
+                fresh.append(article)
+                fresh_ids.add(id(article))
+                continue
+            add_duplicate(representative, article)
+            if id(representative) not in fresh_ids:
+                updated[representative["link"]] = representative
+        return fresh, list(updated.values())
+
+
+def add_duplicate(representative, duplicate):
+    """Record `duplicate` as another source of the story `representative` stands for."""
+    sources = representative.setdefault("sources", [representative.get("source", "")])
+    if duplicate.get("source") and duplicate["source"] not in sources:
+        sources.append(duplicate["source"])
+    links = representative.setdefault("duplicate_links", [])
+    if duplicate["link"] not in links:
+        links.append(duplicate["link"])
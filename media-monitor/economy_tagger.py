@@ -0,0 +1,155 @@
+import re
+
+# Canonical APEC economy labels (as stored in articles and signals) → names
+# and synonyms that count as a mention of the economy itself
+ECONOMY_ALIASES = {
+    "Australia":         ["Australia"],
+    "Brunei Darussalam": ["Brunei Darussalam", "Brunei"],
+    "Canada":            ["Canada"],
+    "Chile":             ["Chile"],
+    "China":             ["China", "PRC", "People's Republic of China", "Mainland China"],
+    "Hong Kong":         ["Hong Kong", "Hong Kong, China", "HK", "HKSAR"],
+    "Indonesia":         ["Indonesia", "Republic of Indonesia"],
+    "Japan":             ["Japan"],
+    "Korea":             ["Korea", "Republic of Korea", "South Korea", "ROK"],
+    "Malaysia":          ["Malaysia"],
+    "Mexico":            ["Mexico"],
+    "New Zealand":       ["New Zealand", "NZ"],
+    "Papua New Guinea":  ["Papua New Guinea", "PNG"],
+    "Peru":              ["Peru"],
+    "Philippines":       ["Philippines", "The Philippines", "PHL"],
+    "Russia":            ["Russia", "Russian Federation"],
+    "Singapore":         ["Singapore"],
+    "Chinese Taipei":    ["Chinese Taipei", "Taiwan"],
+    "Thailand":          ["Thailand"],
+    "United States":     ["United States", "United States of America", "USA", "US", "U.S.", "U.S.A."],
+    "Vietnam":           ["Vietnam", "Viet Nam"],
+}
+
+# Demonyms and capitals: still a mention, but an article naming an economy
+# outright is filed under that economy first. Capitals that are also common
+# words or eponyms (Ottawa Convention, Duke of Wellington, Lima, Santiago,
+# Washington, DC) are left out.
+ECONOMY_PLACES = {
+    "Australia":         ["Australian", "Canberra"],
+    "Brunei Darussalam": ["Bruneian", "Bandar Seri Begawan"],
+    "Canada":            ["Canadian"],
+    "Chile":             ["Chilean"],
+    "China":             ["Chinese", "Beijing"],
+    "Indonesia":         ["Indonesian", "Jakarta"],
+    "Japan":             ["Japanese", "Tokyo"],
+    "Korea":             ["South Korean", "Korean", "Seoul"],
+    "Malaysia":          ["Malaysian", "Kuala Lumpur", "Putrajaya"],
+    "Mexico":            ["Mexican", "Mexico City"],
+    "New Zealand":       ["New Zealander"],
+    "Papua New Guinea":  ["Port Moresby"],
+    "Peru":              ["Peruvian"],
+    "Philippines":       ["Philippine", "Filipino", "Manila"],
+    "Russia":            ["Russian", "Moscow", "Kremlin"],
+    "Singapore":         ["Singaporean"],
+    "Chinese Taipei":    ["Taiwanese", "Taipei"],
+    "Thailand":          ["Thai", "Bangkok"],
+    "United States":     ["Washington D.C."],
+    "Vietnam":           ["Vietnamese", "Hanoi"],
+}
+
+# Phrases that contain an alias but are not a mention of that economy. They
+# are matched like aliases, so they swallow the shorter alias inside them.
+EXCLUSIONS = [
+    "North Korea", "North Korean", "Democratic People's Republic of Korea", "DPRK",
+    "New Mexico", "Washington State",
+]
+
+# Inflections allowed after an alias ("Koreans", "Thais"), not arbitrary continuations
+INFLECTIONS = r"(?:s|'s)?"
+
+
+def trie_pattern(words):
+    """Regex matching any of `words`, factored into a prefix trie.
+
+    Python's `re` tries the branches of a flat alternation one by one at
+    every position; sharing prefixes ("korea", "korean") lets it reject a
+    position after a character or two. Longer words still win, because
+    every optional tail is greedy.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of a word
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def is_acronym(alias):
+    """Short all-caps aliases (US, HK, NZ, ROK) only count when written in capitals."""
+    letters = alias.replace(".", "")
+    return letters.isalpha() and letters.isupper() and len(letters) <= 5
+
+
+class EconomyTagger:
+    """Every economy alias compiled into one alternation, matched in a single pass.
+
+    Aliases match on word boundaries and the longest one wins, so
+    "Republic of Korea" beats "Korea" and "Mexico City" beats "Mexico".
+    Acronyms are case-sensitive ("US" but not "us"); everything else
+    ignores case. Exclusions ("North Korea") consume their span without
+    tagging anything. `places` (demonyms, capitals) tag like aliases but
+    rank after economies that are named outright.
+    """
+
+    def __init__(self, aliases=ECONOMY_ALIASES, exclusions=EXCLUSIONS, places=None):
+        self.economies = list(aliases)
+        self.exact = {}     # acronym -> (economy, rank); None for an exclusion
+        self.folded = {}    # lowercase alias -> (economy, rank); None for an exclusion
+        for economy, names in aliases.items():
+            for name in [economy] + list(names):
+                self._add(name, (economy, 0))
+        for economy, names in (places or {}).items():
+            for name in names:
+                self._add(name, (economy, 1))
+        for phrase in exclusions:
+            self._add(phrase, None)
+
+        # Matching ignores case throughout; lookup() drops acronyms written in lower case
+        alternatives = {a.lower() for a in self.exact} | set(self.folded)
+        self.pattern = re.compile(
+            rf"(?<!\w)(?P<alias>{trie_pattern(alternatives)}){INFLECTIONS}(?!\w)", re.IGNORECASE
+        )
+
+    def _add(self, name, economy):
+        if is_acronym(name):
+            self.exact.setdefault(name, economy)
+        else:
+            self.folded.setdefault(name.lower(), economy)
+
+    def lookup(self, alias):
+        if alias in self.exact:
+            return self.exact[alias]
+        return self.folded.get(alias.lower())
+
+    def tag(self, text):
+        """Every economy mentioned in `text`, most prominent first.
+
+        Economies named outright come before ones only referred to by a
+        demonym or capital; within each group the most mentioned comes
+        first, ties going to the earliest mention.
+        """
+        found = {}  # economy -> [rank, -mentions, first position]
+        for m in self.pattern.finditer(text or ""):
+            hit = self.lookup(m.group("alias"))
+            if hit is None:
+                continue
+            economy, rank = hit
+            entry = found.setdefault(economy, [rank, 0, m.start()])
+            entry[0] = min(entry[0], rank)
+            entry[1] -= 1
+        return sorted(found, key=found.get)
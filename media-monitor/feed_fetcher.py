@@ -0,0 +1,106 @@
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+import feedparser
+
+# === Fetch limits ===
+MAX_WORKERS = 8        # global cap on concurrent requests
+PER_HOST_LIMIT = 2     # concurrent requests allowed against a single host
+DEFAULT_TIMEOUT = 15   # seconds, per socket operation
+
+# Per-host timeout overrides for sources known to be slow
+HOST_TIMEOUTS = {
+    "www.apec.org": 30,
+}
+
+USER_AGENT = "US-APEC-RISE-Media-Monitor/1.0 (+https://github.com/usapecrise/US-APEC-RISE-Risk-Monitoring-Suite)"
+
+
+class HostLimiter:
+    """Hands out one semaphore per host so a single slow host can't take every worker."""
+
+    def __init__(self, per_host_limit):
+        self.per_host_limit = per_host_limit
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._slots[host]
+
+
+def fetch_feed(url, timeout=DEFAULT_TIMEOUT, limiter=None, request_headers=None):
+    """Download and parse one feed. Never raises; failures are recorded on the result.
+
+    A 304 reply to a conditional request is not an error: the result has
+    `not_modified` set and no entries, and the body is never parsed.
+    """
+    host = urlparse(url).netloc
+    result = {
+        "url": url,
+        "host": host,
+        "status": None,
+        "elapsed": 0.0,
+        "bytes": 0,
+        "error": None,
+        "not_modified": False,
+        "etag": None,
+        "last_modified": None,
+        "entries": [],
+    }
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **(request_headers or {})})
+    slot = limiter.slot(host) if limiter else nullcontext()
+
+    body = None
+    with slot:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+                result["status"] = response.status
+                headers = {k.lower(): v for k, v in response.headers.items()}
+                result["etag"] = headers.get("etag")
+                result["last_modified"] = headers.get("last-modified")
+        except urllib.error.HTTPError as e:
+            result["status"] = e.code
+            if e.code == 304:
+                result["not_modified"] = True
+            else:
+                result["error"] = f"HTTP {e.code}"
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["elapsed"] = round(time.perf_counter() - start, 3)
+
+    # Parsing is CPU work, so it happens after the host slot is released
+    if body is not None:
+        result["bytes"] = len(body)
+        result["entries"] = feedparser.parse(body, response_headers=headers).entries
+    return result
+
+
+def fetch_feeds(urls, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT,
+                timeout=DEFAULT_TIMEOUT, host_timeouts=None, state=None):
+    """Fetch every feed concurrently and return the results in the same order as `urls`.
+
+    When a FeedStateStore is passed as `state`, each request is sent as a
+    conditional GET using the feed's stored ETag / Last-Modified.
+    """
+    host_timeouts = HOST_TIMEOUTS if host_timeouts is None else host_timeouts
+    limiter = HostLimiter(per_host_limit)
+
+    def run(url):
+        host_timeout = host_timeouts.get(urlparse(url).netloc, timeout)
+        request_headers = state.conditional_headers(url) if state else None
+        return fetch_feed(url, timeout=host_timeout, limiter=limiter, request_headers=request_headers)
+
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(run, urls))
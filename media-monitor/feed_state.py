@@ -0,0 +1,53 @@
+import json
+import os
+
+FEED_STATE_PATH = "data/feed_state.json"
+MAX_SEEN_IDS = 200  # per feed; comfortably more than any feed returns at once
+
+
+def entry_key(entry):
+    """Stable identity for a feed entry: its guid when present, else its link."""
+    return (entry.get("id") or entry.get("link") or "").strip()
+
+
+class FeedStateStore:
+    """Per-feed ETag, Last-Modified and recently seen entry IDs, persisted as JSON."""
+
+    def __init__(self, path=FEED_STATE_PATH):
+        self.path = path
+        self.feeds = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.feeds = json.load(f)
+
+    def get(self, url):
+        return self.feeds.get(url, {})
+
+    def conditional_headers(self, url):
+        state = self.get(url)
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def seen_ids(self, url):
+        return set(self.get(url).get("seen_ids", []))
+
+    def update(self, url, etag=None, last_modified=None, entry_ids=()):
+        state = self.feeds.setdefault(url, {})
+        if etag:
+            state["etag"] = etag
+        if last_modified:
+            state["last_modified"] = last_modified
+        # Newest IDs first so truncation drops the oldest ones
+        merged = list(dict.fromkeys([i for i in entry_ids if i] + state.get("seen_ids", [])))
+        state["seen_ids"] = merged[:MAX_SEEN_IDS]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.feeds, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
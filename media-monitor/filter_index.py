@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Single-valued columns indexed as-is; `workstreams` is split on commas
+INDEXED_COLUMNS = ["economy", "sentiment", "source_type"]
+
+# Columns with a precomputed sort rank, so ordering a filtered subset is one argsort
+SORTABLE_COLUMNS = ["timestamp", "title", "economy"]
+
+
+def split_workstreams(value):
+    return [w.strip() for w in str(value).split(",") if w.strip()]
+
+
+class FilterIndex:
+    """Inverted indexes from filter values to packed row-ID bitsets.
+
+    Built once per data load. A sidebar selection is then a bitwise AND of
+    at most four bitsets rather than a boolean scan of every column.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.bitsets = {}
+
+        for col in INDEXED_COLUMNS:
+            codes = pd.Categorical(df[col].astype(object).fillna("Unknown"))
+            self.bitsets[col] = {
+                value: np.packbits(codes.codes == i)
+                for i, value in enumerate(codes.categories)
+            }
+
+        # Each distinct comma-joined combination is split once, then OR-ed into its workstreams
+        combos = pd.Categorical(df["workstreams"].astype(object).fillna(""))
+        workstream_masks = {}
+        for i, combo in enumerate(combos.categories):
+            mask = combos.codes == i
+            for ws in split_workstreams(combo):
+                if ws in workstream_masks:
+                    workstream_masks[ws] |= mask
+                else:
+                    workstream_masks[ws] = mask.copy()
+        self.bitsets["workstreams"] = {ws: np.packbits(m) for ws, m in workstream_masks.items()}
+
+        self.ranks = {}
+        for col in SORTABLE_COLUMNS:
+            order = np.argsort(df[col].astype(str).to_numpy(), kind="stable")
+            rank = np.empty(self.n_rows, dtype=np.int64)
+            rank[order] = np.arange(self.n_rows)
+            self.ranks[col] = rank
+
+    def values(self, col):
+        return sorted(self.bitsets[col])
+
+    def select(self, **filters):
+        """Row positions matching every filter; a value of None or "All" means no filter."""
+        selected = None
+        for col, value in filters.items():
+            if value is None or value == "All":
+                continue
+            bits = self.bitsets[col].get(value)
+            if bits is None:
+                return np.array([], dtype=np.int64)
+            selected = bits if selected is None else selected & bits
+        if selected is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(selected, count=self.n_rows))
+
+    def ordered(self, rows, col, ascending=True):
+        """`rows` sorted by a precomputed column rank."""
+        order = np.argsort(self.ranks[col][rows], kind="stable")
+        return rows[order] if ascending else rows[order[::-1]]
@@ -1,12 +1,30 @@
-import pandas as pd
+import argparse
+import hashlib
 import json
+import os
+import sys
+import pandas as pd
+from datetime import date, timedelta
 from pathlib import Path
 
-# === Load articles ===
-with open("data/processed_articles.json", "r", encoding="utf-8") as f:
-    articles = json.load(f)
+from article_store import ArticleStore
+from signal_matcher import SignalMatcher
+from signal_rollup import ROLLUP_PATH, TOTALS_COLUMNS, TOTALS_KEYS, TOTALS_PATH, update_rollup, update_totals
+from signal_scores import SCORES_PATH, SignalScores, day_number
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))  # repo root
+from run_metrics import start_run  # noqa: E402
+
+OUTPUT_PATH = Path("data/risk_signals.csv")
+STATE_PATH = Path("data/signal_state.json")
+
+# Only keyword hits are written; Baseline rows are implied by the article totals
+SIGNAL_FORMAT = "sparse"
 
-df = pd.DataFrame(articles)
+SIGNAL_COLUMNS = [
+    "Economy", "Workstream", "Assumption", "Scenario",
+    "Justification", "Signal Strength", "Link", "Week"
+]
 
 # === Define keyword sets for each assumption ===
 assumption_keywords = {
@@ -54,16 +72,38 @@ assumption_keywords = {
 }
 
 # === Detect scenario signals ===
-signals = []
+def keywords_hash(keywords=assumption_keywords):
+    """Fingerprint of the keyword config; any edit forces a full rebuild."""
+    return hashlib.sha256(json.dumps(keywords, sort_keys=True).encode("utf-8")).hexdigest()
 
-for _, row in df.iterrows():
-    text = f"{row.get('title', '')} {row.get('summary', '')}".lower()
-    economy = row.get("economy", "Unknown")
-    workstream = row.get("workstreams", "Uncategorized")
+def week_of(timestamp):
+    """Monday (ISO date) of the week an article was stored in, or "" when undated."""
+    try:
+        day = date.fromisoformat((timestamp or "")[:10])
+    except ValueError:
+        return ""
+    return (day - timedelta(days=day.weekday())).isoformat()
 
-    for assumption, patterns in assumption_keywords.items():
-        matched_optimistic = [kw for kw in patterns["optimistic"] if kw in text]
-        matched_pessimistic = [kw for kw in patterns["pessimistic"] if kw in text]
+def article_keys(row):
+    """(Economy, Workstream, Week) an article's signals and totals are filed under."""
+    return row.get("economy", "Unknown"), row.get("workstreams", "Uncategorized"), week_of(row.get("timestamp"))
+
+def article_totals(articles):
+    """Articles per (Economy, Workstream, Week): every one is a Baseline signal for each assumption it doesn't hit."""
+    totals = pd.DataFrame([article_keys(row) for row in articles], columns=TOTALS_KEYS, dtype=object)
+    return totals.groupby(TOTALS_KEYS, sort=False).size().reset_index(name="Articles")[TOTALS_COLUMNS]
+
+def classify_article(row, matcher):
+    """Signal rows for the assumptions an article hits; assumptions without keywords are Baseline, left implicit."""
+    # One compiled pass per article instead of a substring test per keyword
+    text = f"{row.get('title', '')} {row.get('summary', '')}"
+    economy, workstream, week = article_keys(row)
+    matched = matcher.matched_keywords(text)
+
+    rows = []
+    for assumption in assumption_keywords:
+        matched_optimistic = matched.get(assumption, {}).get("optimistic", [])
+        matched_pessimistic = matched.get(assumption, {}).get("pessimistic", [])
 
         if matched_pessimistic:
             scenario = "Pessimistic"
@@ -74,21 +114,124 @@ for _, row in df.iterrows():
             justification = ", ".join(matched_optimistic)
             strength = "Medium"
         else:
-            scenario = "Baseline"
-            justification = "No signal keywords detected."
-            strength = "Low"
+            continue
 
-        signals.append({
+        rows.append({
             "Economy": economy,
             "Workstream": workstream,
             "Assumption": assumption,
             "Scenario": scenario,
             "Justification": justification,
-            "Signal Strength": strength
+            "Signal Strength": strength,
+            "Link": row.get("link", ""),
+            "Week": week
         })
+    return rows
+
+# === Incremental state ===
+def load_state():
+    if STATE_PATH.exists():
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def save_state(state):
+    tmp_path = STATE_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_PATH)
 
-# === Save to CSV ===
-output_path = Path("data/risk_signals.csv")
-pd.DataFrame(signals).to_csv(output_path, index=False)
-print(f"✅ Signals saved to {output_path}")
+def rebuild_reason(state, full):
+    if full:
+        return "--full requested"
+    if not OUTPUT_PATH.exists() or not state.get("high_water"):
+        return "no previous run"
+    if state.get("incomplete"):
+        return "previous run did not finish"
+    if state.get("keywords_hash") != keywords_hash():
+        return "assumption_keywords changed"
+    if state.get("columns") != SIGNAL_COLUMNS:
+        return "signal columns changed"
+    if state.get("format") != SIGNAL_FORMAT:
+        return "signal format changed"
+    if not Path(TOTALS_PATH).exists():
+        return "no article totals yet"
+    if not Path(SCORES_PATH).exists():
+        return "no signal scores yet"
+    return None
+
+def report_movers(scores, top=5):
+    """Print the (economy, assumption) cells whose pessimistic signals are picking up fastest."""
+    rising = [r for r in scores.summary() if r["Scenario"] == "Pessimistic" and r["Trend"] > 0]
+    rising.sort(key=lambda r: (r["Acceleration"], r["Trend"]), reverse=True)
+    for r in rising[:top]:
+        print(f"📈 {r['Economy']} / {r['Assumption']}: {r['7d']} pessimistic signals in 7d "
+              f"(trend {r['Trend']:+.2f}/day, acceleration {r['Acceleration']:+d})")
+
+def main(full=False):
+    with start_run("generate_signals") as run:
+        state = load_state()
+        reason = rebuild_reason(state, full)
+        since = None if reason else state["high_water"]
+
+        # Only articles stored after the high-water mark are classified in incremental mode
+        with run.stage("load"):
+            articles = ArticleStore().load(since=since)
+        with run.stage("classify"):
+            matcher = SignalMatcher(assumption_keywords)
+            scores = SignalScores(reset=bool(reason))
+            new_signals = []
+            for row in articles:
+                day = day_number(row.get("timestamp"))
+                for signal in classify_article(row, matcher):
+                    new_signals.append(signal)
+                    scores.add(signal, day)
+            new_df = pd.DataFrame(new_signals, columns=SIGNAL_COLUMNS)
+            new_totals = article_totals(articles)
+        run.count("articles_classified", len(articles))
+        run.count("signal_rows_written", len(new_df))
+
+        # Until the final state is saved, a failure anywhere below leaves the outputs
+        # partly updated; the marker makes the next run rebuild them instead of appending again
+        save_state({**state, "incomplete": True})
+
+        # === Save to CSV ===
+        with run.stage("write"):
+            if reason:
+                print(f"🔁 Full rebuild ({reason}): {len(articles)} articles")
+                new_df.to_csv(OUTPUT_PATH, index=False)
+            else:
+                # Articles past the high-water mark have no rows yet (a run that failed after
+                # writing left the incomplete marker and forced a rebuild), so appending is enough
+                print(f"➕ Incremental run since {since}: {len(articles)} new articles")
+                new_df.to_csv(OUTPUT_PATH, mode="a", header=False, index=False)
+            update_totals(new_totals, rebuild=bool(reason))
+
+        # === Weekly rollup cube for the dashboard overview ===
+        with run.stage("rollup"):
+            cube_rows = update_rollup(
+                new_df, new_totals, assumption_keywords, rebuild=bool(reason), signals_path=OUTPUT_PATH
+            )
+        print(f"🧊 Rollup {ROLLUP_PATH} → {cube_rows} rows")
+
+        # === Decayed scores and rolling windows ===
+        with run.stage("scores"):
+            scores.save()
+        report_movers(scores)
+
+        high_water = max((a.get("timestamp", "") for a in articles), default="")
+        if not reason:
+            high_water = max(high_water, state["high_water"])
+        save_state({
+            "keywords_hash": keywords_hash(),
+            "columns": SIGNAL_COLUMNS,
+            "format": SIGNAL_FORMAT,
+            "assumptions": list(assumption_keywords),
+            "high_water": high_water
+        })
+        print(f"✅ Signals saved to {OUTPUT_PATH} ({len(new_df)} new rows)")
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classify articles into scenario signals.")
+    parser.add_argument("--full", action="store_true", help="ignore the high-water mark and rebuild every signal row")
+    main(full=parser.parse_args().full)
@@ -3,12 +3,14 @@ import json
 from datetime import datetime
 import os
 
+from economy_tagger import ECONOMY_ALIASES, ECONOMY_PLACES, EconomyTagger
+
 # ✅ Ensure the /data folder exists
 os.makedirs("data", exist_ok=True)
 
 rss_sources = [
     # 🌐 Media
-    {"url": "https://www.smh.com.au/rss/world.xml", "source_type": "Media"}
+    {"url": "https://www.smh.com.au/rss/world.xml", "source_type": "Media"},
     {"url": "https://www.straitstimes.com/news/world/rss.xml", "source_type": "Media"},
     {"url": "https://www.straitstimes.com/news/asia/rss.xml", "source_type": "Media"},
     {"url": "https://feeds.bbci.co.uk/news/rss.xml", "source_type": "Media"},
@@ -20,8 +22,8 @@ rss_sources = [
     {"url": "https://vietnamnews.vn/rss/world.rss", "source_type": "Media"},
     {"url": "https://www.philstar.com/rss/world", "source_type": "Media"},
     {"url": "https://nzherald.co.nz/rss/", "source_type": "Media"},
-    {"url": "https://www.rnz.co.nz/rss/pacific.xml", "source_type": "Media"}
-    {"url": "https://www.rnz.co.nz/rss/world.xml", "source_type": "Media"}
+    {"url": "https://www.rnz.co.nz/rss/pacific.xml", "source_type": "Media"},
+    {"url": "https://www.rnz.co.nz/rss/world.xml", "source_type": "Media"},
     {"url": "https://thediplomat.com/feed/", "source_type": "Media"},
     
     # 🏛 Government
@@ -71,50 +73,11 @@ rss_sources = [
     {"url": "https://www.reutersagency.com/feed/?best-topics=trade&post_type=best", "source_type": "Private Sector"}
 ]
 
-# APEC economies + synonyms + capital cities
-economy_keywords = {
-    "Australia":             ["Australia", "Canberra"],
-    "Brunei":                ["Brunei", "Brunei Darussalam", "Bandar Seri Begawan"],
-    "Canada":                ["Canada", "Ottawa"],
-    "Chile":                 ["Chile", "Santiago"],
-    "China":                 ["China", "PRC", "People's Republic of China", "Mainland China", "Beijing"],
-    "Hong Kong, China":      ["Hong Kong", "HK"],
-    "Indonesia":             ["Indonesia", "Republic of Indonesia", "Jakarta"],
-    "Japan":                 ["Japan", "Tokyo"],
-    "Republic of Korea":     ["Republic of Korea", "South Korea", "ROK", "Korea", "Seoul"],
-    "Malaysia":              ["Malaysia", "Malaysian", "Kuala Lumpur"],
-    "Mexico":                ["Mexico", "Mexican", "Mexico City"],
-    "New Zealand":           ["New Zealand", "NZ", "Wellington"],
-    "Papua New Guinea":      ["Papua New Guinea", "PNG", "Port Moresby"],
-    "Peru":                  ["Peru", "Peruvian", "Lima"],
-    "The Philippines":       ["The Philippines", "Philippines", "PHL", "Manila"],
-    "Russia":                ["Russia", "Russian Federation", "Russian", "Moscow"],
-    "Singapore":             ["Singapore"],  # city-state, so repeats
-    "Chinese Taipei":        ["Chinese Taipei", "Taipei", "Taiwan"],
-    "Thailand":              ["Thailand", "Thai", "Bangkok"],
-    "United States":         ["United States", "USA", "US", "Washington", "Washington D.C.", "DC"],
-    "Vietnam":               ["Vietnam", "Viet Nam", "Hanoi"]
-}
+economy_tagger = EconomyTagger(ECONOMY_ALIASES, places=ECONOMY_PLACES)
 
 def tag_economy(text):
-    """Return list of economies whose keywords (including capitals) appear in text."""
-    found = []
-    lower = text.lower()
-    for econ, patterns in economy_keywords.items():
-        for pat in patterns:
-            if pat.lower() in lower:
-                found.append(econ)
-                break
-    return found or ["Uncategorized"]
-
-]
-
-def tag_economies(text):
-    matches = []
-    for econ in known_economies:
-        if econ.lower() in text.lower():
-            matches.append(econ)
-    return list(set(matches)) or ["Unknown"]
+    """Return list of economies whose names, demonyms or capitals appear in text."""
+    return economy_tagger.tag(text) or ["Uncategorized"]
 
 # ✅ Parse RSS feeds
 articles = []
@@ -145,7 +108,7 @@ for source in rss_sources:
             "aligned_with_us": "Unknown",
             "matched_alignment_phrase": "",
             "reform_themes": "",
-            "economy": ", ".join(tag_economies(title + summary + link)),
+            "economy": ", ".join(tag_economy(f"{title} {summary} {link}")),
             "source_type": source_type
         }
         articles.append(article)
@@ -0,0 +1,56 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from textblob import TextBlob
+
+POSITIVE_THRESHOLD = 0.2
+NEGATIVE_THRESHOLD = -0.2
+PARALLEL_MIN_BATCH = 200  # below this, starting worker processes costs more than it saves
+
+
+def content_hash(text):
+    """Whitespace-insensitive hash, so syndicated copies of a story share one score."""
+    normalized = " ".join(text.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def polarity(text):
+    return TextBlob(text).sentiment.polarity
+
+
+def label_for(score):
+    return "Positive" if score > POSITIVE_THRESHOLD else "Negative" if score < NEGATIVE_THRESHOLD else "Neutral"
+
+
+class SentimentScorer:
+    """Scores batches of texts, each distinct text only once.
+
+    Results are memoized on the content hash for the life of the scorer.
+    Large batches of unseen texts are spread over a process pool.
+    """
+
+    def __init__(self, workers=None, parallel_min_batch=PARALLEL_MIN_BATCH):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min_batch = parallel_min_batch
+        self.cache = {}
+
+    def score_batch(self, texts):
+        """Return (label, polarity) for every text, in input order."""
+        hashes = [content_hash(t) for t in texts]
+        pending = {}
+        for h, text in zip(hashes, texts):
+            if h not in self.cache and h not in pending:
+                pending[h] = text
+
+        if pending:
+            todo = list(pending.values())
+            if len(todo) >= self.parallel_min_batch and self.workers > 1:
+                chunksize = max(1, len(todo) // (self.workers * 4))
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    scores = list(pool.map(polarity, todo, chunksize=chunksize))
+            else:
+                scores = [polarity(t) for t in todo]
+            self.cache.update(zip(pending.keys(), scores))
+
+        return [(label_for(self.cache[h]), self.cache[h]) for h in hashes]
@@ -0,0 +1,52 @@
+import re
+from collections import namedtuple
+
+Hit = namedtuple("Hit", ["assumption", "polarity", "keyword", "start", "end"])
+
+# Inflections allowed after a keyword ("protests", "resigned", "resignation"),
+# so word continuations such as "protestant" or "pppoe" don't count.
+INFLECTIONS = r"(?:s|es|d|ed|ing|ation)?"
+
+
+class SignalMatcher:
+    """Every assumption keyword compiled into one case-insensitive alternation.
+
+    A single `finditer` pass over the text finds all keyword hits. Keywords
+    are tried longest first, so "investment withdrawal" wins over
+    "investment" at the same position, and a keyword listed under several
+    assumptions ("protest") yields one hit per assumption.
+    """
+
+    def __init__(self, assumption_keywords):
+        self.targets = {}  # lowercase keyword -> [(assumption, polarity)]
+        self.rank = {}     # (assumption, polarity, keyword) -> position in the config
+        for assumption, patterns in assumption_keywords.items():
+            for polarity, keywords in patterns.items():
+                for i, kw in enumerate(keywords):
+                    self.targets.setdefault(kw.lower(), []).append((assumption, polarity))
+                    self.rank[(assumption, polarity, kw.lower())] = i
+
+        alternation = "|".join(re.escape(kw) for kw in sorted(self.targets, key=len, reverse=True))
+        self.pattern = re.compile(rf"(?<!\w)(?P<kw>{alternation}){INFLECTIONS}(?!\w)", re.IGNORECASE)
+
+    def scan(self, text):
+        """All hits in `text` as (assumption, polarity, keyword, start, end), in text order."""
+        hits = []
+        for m in self.pattern.finditer(text):
+            kw = m.group("kw").lower()
+            for assumption, polarity in self.targets[kw]:
+                hits.append(Hit(assumption, polarity, kw, m.start(), m.end()))
+        return hits
+
+    def matched_keywords(self, text):
+        """{assumption: {polarity: [keywords]}} with keywords deduplicated and in config order."""
+        found = {}
+        for hit in self.scan(text):
+            found.setdefault(hit.assumption, {}).setdefault(hit.polarity, set()).add(hit.keyword)
+        return {
+            assumption: {
+                polarity: sorted(kws, key=lambda kw: self.rank[(assumption, polarity, kw)])
+                for polarity, kws in by_polarity.items()
+            }
+            for assumption, by_polarity in found.items()
+        }
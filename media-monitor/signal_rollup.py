@@ -0,0 +1,95 @@
+import os
+
+import pandas as pd
+
+ROLLUP_PATH = "data/scenario_rollup.csv"
+TOTALS_PATH = "data/signal_totals.csv"
+
+ROLLUP_KEYS = ["Economy", "Workstream", "Assumption", "Week", "Scenario", "Signal Strength"]
+ROLLUP_COLUMNS = ROLLUP_KEYS + ["Signals"]
+CELL_KEYS = ["Economy", "Workstream", "Assumption", "Week"]
+
+# Articles per economy, workstream and week; Baseline signals are these minus the keyword hits
+TOTALS_KEYS = ["Economy", "Workstream", "Week"]
+TOTALS_COLUMNS = TOTALS_KEYS + ["Articles"]
+BASELINE = {"Scenario": "Baseline", "Signal Strength": "Low"}
+
+
+def explode_workstreams(df):
+    """One row per workstream of a ", "-joined Workstream value; untagged rows count as Uncategorized."""
+    df = df.astype(object).fillna("")
+    df["Workstream"] = df["Workstream"].replace("", "Uncategorized").str.split(", ")
+    return df.explode("Workstream")
+
+
+def rollup(signals, totals, assumptions):
+    """Signal rows counted per key, with Baseline counts rebuilt from the article totals.
+
+    A row tagged with several workstreams counts once under each. Every
+    article has one signal per assumption, so the Baseline count of a cell
+    is its articles minus its keyword hits.
+    """
+    hits = pd.DataFrame(columns=ROLLUP_COLUMNS)
+    if not signals.empty:
+        hits = explode_workstreams(signals[ROLLUP_KEYS]).groupby(ROLLUP_KEYS, sort=False).size()
+        hits = hits.reset_index(name="Signals")
+    if totals.empty:
+        return hits
+
+    articles = explode_workstreams(totals[TOTALS_COLUMNS]).merge(
+        pd.DataFrame({"Assumption": list(assumptions)}), how="cross"
+    )
+    articles = articles.groupby(CELL_KEYS)["Articles"].sum()
+    hit_counts = hits.groupby(CELL_KEYS)["Signals"].sum().reindex(articles.index, fill_value=0)
+    baseline = (articles - hit_counts).rename("Signals").reset_index()
+    baseline = baseline[baseline["Signals"] > 0].assign(**BASELINE)
+    return pd.concat([hits, baseline[ROLLUP_COLUMNS]], ignore_index=True)
+
+
+def read_counts(path, keys):
+    return pd.read_csv(path, dtype={key: str for key in keys}, keep_default_na=False)
+
+
+def read_rollup(path=ROLLUP_PATH):
+    return read_counts(path, ROLLUP_KEYS)
+
+
+def add_counts(counts, path, keys, value):
+    """`counts` plus the counts already at `path`, summed per key; counts are additive across runs."""
+    if not os.path.exists(path):
+        return counts
+    combined = pd.concat([read_counts(path, keys), counts], ignore_index=True)
+    return combined.groupby(keys, sort=False)[value].sum().reset_index()
+
+
+def write_counts(counts, path, keys):
+    """Sort and atomically write a count table. Returns the number of rows."""
+    counts = counts.sort_values(keys, kind="stable")
+    tmp_path = f"{path}.tmp"
+    counts.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return len(counts)
+
+
+def update_totals(new_totals, rebuild, path=TOTALS_PATH):
+    """Fold the new articles' totals into the totals file. Returns the number of rows."""
+    counts = new_totals if rebuild else add_counts(new_totals, path, TOTALS_KEYS, "Articles")
+    return write_counts(counts, path, TOTALS_KEYS)
+
+
+def update_rollup(new_signals, new_totals, assumptions, rebuild, signals_path,
+                  totals_path=TOTALS_PATH, path=ROLLUP_PATH):
+    """Fold new signal rows and article totals into the cube and write it. Returns the number of cube rows.
+
+    An incremental run only adds the new rows' counts. The cube is rebuilt
+    when the signals were, or from the full signals and totals files (already
+    updated for this run) when it doesn't exist yet.
+    """
+    if rebuild:
+        cube = rollup(new_signals, new_totals, assumptions)
+    elif not os.path.exists(path):
+        signals = pd.read_csv(signals_path, dtype=str, keep_default_na=False)
+        cube = rollup(signals, read_counts(totals_path, TOTALS_KEYS), assumptions)
+    else:
+        cube = add_counts(rollup(new_signals, new_totals, assumptions), path, ROLLUP_KEYS, "Signals")
+    return write_counts(cube, path, ROLLUP_KEYS)
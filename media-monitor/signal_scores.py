@@ -0,0 +1,132 @@
+import json
+import os
+from datetime import date
+
+SCORES_PATH = "data/signal_scores.json"
+HALF_LIFE_DAYS = 14          # a signal counts half as much two weeks later
+WINDOWS = (7, 30, 90)        # rolling windows reported per cell, in days
+RING_DAYS = max(WINDOWS)     # daily bins kept per cell
+SCORED_SCENARIOS = ("Pessimistic", "Optimistic")
+
+
+def day_number(timestamp):
+    """Proleptic ordinal of the day in an ISO timestamp, or None when undated."""
+    try:
+        return date.fromisoformat((timestamp or "")[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def decay(days):
+    return 0.5 ** (days / HALF_LIFE_DAYS)
+
+
+class ScoreCell:
+    """Decayed score and daily ring buffer of one scenario's signals for an (economy, assumption).
+
+    `score` is exact as of `day`, the latest day seen; older values are
+    aged lazily, so an update is O(1) instead of a pass over history.
+    `bins[d % RING_DAYS]` counts the signals of day `d` for the last
+    RING_DAYS days up to `day`.
+    """
+
+    def __init__(self, score=0.0, day=None, bins=None):
+        self.score = score
+        self.day = day
+        self.bins = bins or [0] * RING_DAYS
+
+    def add(self, day, weight=1.0):
+        if self.day is None:
+            self.day = day
+        if day > self.day:
+            self.score *= decay(day - self.day)
+            # Clear the bins of the days skipped over; they wrap to stale counts otherwise
+            for d in range(self.day + 1, min(day, self.day + RING_DAYS) + 1):
+                self.bins[d % RING_DAYS] = 0
+            self.day = day
+        age = self.day - day
+        self.score += weight * decay(age)
+        if age < RING_DAYS:
+            self.bins[day % RING_DAYS] += 1
+
+    def score_at(self, day):
+        return self.score * decay(max(day - self.day, 0)) if self.day is not None else 0.0
+
+    def count(self, days, end, skip=0):
+        """Signals in the `days` days ending `skip` days before `end` (inclusive)."""
+        if self.day is None:
+            return 0
+        last = end - skip
+        first = max(last - days + 1, self.day - RING_DAYS + 1)
+        return sum(self.bins[d % RING_DAYS] for d in range(first, min(last, self.day) + 1))
+
+    def to_json(self):
+        return {"score": self.score, "day": date.fromordinal(self.day).isoformat(), "bins": self.bins}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["score"], date.fromisoformat(data["day"]).toordinal(), data["bins"])
+
+
+class SignalScores:
+    """Per-(economy, assumption) decayed pessimistic/optimistic scores, persisted as JSON.
+
+    Fed each new signal once by generate_signals.py; a full rebuild starts
+    from an empty store. Readers get window counts, trend and acceleration
+    without rescanning risk_signals.csv.
+    """
+
+    def __init__(self, path=SCORES_PATH, reset=False):
+        self.path = path
+        self.cells = {}   # (economy, assumption, scenario) -> ScoreCell
+        if not reset and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for entry in json.load(f):
+                    key = (entry["economy"], entry["assumption"], entry["scenario"])
+                    self.cells[key] = ScoreCell.from_json(entry)
+
+    def add(self, signal, day):
+        if day is None or signal["Scenario"] not in SCORED_SCENARIOS:
+            return
+        key = (signal["Economy"], signal["Assumption"], signal["Scenario"])
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = ScoreCell()
+        cell.add(day)
+
+    def latest_day(self):
+        return max((cell.day for cell in self.cells.values()), default=None)
+
+    def summary(self, as_of=None):
+        """One row per (economy, assumption, scenario) as of `as_of` (a day number; default the latest day).
+
+        `trend` is the last week's daily rate minus the 90-day daily rate;
+        `acceleration` is the change in weekly counts this week minus the
+        change the week before (a second difference of the last three weeks).
+        """
+        as_of = as_of or self.latest_day()
+        rows = []
+        for (economy, assumption, scenario), cell in sorted(self.cells.items()):
+            counts = {f"{days}d": cell.count(days, as_of) for days in WINDOWS}
+            weeks = [cell.count(7, as_of, skip=7 * i) for i in range(3)]
+            rows.append({
+                "Economy": economy,
+                "Assumption": assumption,
+                "Scenario": scenario,
+                "Score": round(cell.score_at(as_of), 3),
+                **counts,
+                "Trend": round(counts["7d"] / 7 - counts["90d"] / 90, 3),
+                "Acceleration": (weeks[0] - weeks[1]) - (weeks[1] - weeks[2]),
+            })
+        return rows
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        entries = [
+            {"economy": economy, "assumption": assumption, "scenario": scenario, **cell.to_json()}
+            for (economy, assumption, scenario), cell in sorted(self.cells.items())
+        ]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
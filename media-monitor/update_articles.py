@@ -1,18 +1,23 @@
-import feedparser
-import json
-import re
 import os
-from datetime import datetime
-from textblob import TextBlob
+import re
+import sys
+from datetime import datetime, timedelta
 from urllib.parse import urlparse
 
+from article_snapshot import SNAPSHOT_PATH, update_snapshot
+from article_store import ArticleStore
+from dedupe import DuplicateIndex, clean_url, url_key
+from economy_tagger import ECONOMY_ALIASES, ECONOMY_PLACES, EconomyTagger
+from feed_fetcher import fetch_feeds
+from feed_state import FeedStateStore, entry_key
+from sentiment import SentimentScorer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root
+from run_metrics import start_run  # noqa: E402
+
 # === APEC & Workstream Setup ===
-APEC_ECONOMIES = [
-    "Australia", "Brunei Darussalam", "Canada", "Chile", "China", "Hong Kong",
-    "Indonesia", "Japan", "Korea", "Malaysia", "Mexico", "New Zealand",
-    "Papua New Guinea", "Peru", "Philippines", "Russia", "Singapore",
-    "Chinese Taipei", "Thailand", "United States", "Vietnam"
-]
+APEC_ECONOMIES = list(ECONOMY_ALIASES)
+ECONOMY_TAGGER = EconomyTagger(ECONOMY_ALIASES, places=ECONOMY_PLACES)
 
 WORKSTREAM_KEYWORDS = {
     "Digital Trade": ["digital trade", "e-commerce", "data flow", "cross-border data"],
@@ -45,11 +50,15 @@ FEEDS = [
     "https://www.bangkokpost.com/rss/data/topstories.xml"
 ]
 
-def detect_economy(text):
-    for econ in APEC_ECONOMIES:
-        if econ.lower() in text.lower():
-            return econ
-    return "Unknown"
+# New articles are checked for near-duplicates against articles stored this recently
+DEDUPE_WINDOW_DAYS = 14
+
+# Unseen entries ingested per feed and run; the rest are picked up by the next run
+MAX_ENTRIES_PER_FEED = 15
+
+def detect_economies(text):
+    """All APEC economies mentioned in the text, most prominent first."""
+    return ECONOMY_TAGGER.tag(text)
 
 def tag_workstreams(text):
     tags = []
@@ -58,10 +67,6 @@ def tag_workstreams(text):
             tags.append(ws)
     return ", ".join(tags) if tags else "Uncategorized"
 
-def classify_sentiment(text):
-    score = TextBlob(text).sentiment.polarity
-    return "Positive" if score > 0.2 else "Negative" if score < -0.2 else "Neutral"
-
 def get_source_type(url):
     domain = urlparse(url).netloc
     for key, label in SOURCE_TYPES.items():
@@ -69,58 +74,152 @@ def get_source_type(url):
             return label
     return "Other"
 
-# === Load previous data if it exists ===
-processed_path = "data/processed_articles.json"
-existing_links = set()
-
-if os.path.exists(processed_path):
-    with open(processed_path, "r", encoding="utf-8") as f:
-        existing_data = json.load(f)
-        existing_links = {item["link"] for item in existing_data}
-else:
-    existing_data = []
-
-# === Fetch new articles ===
-articles = []
-
-print("🛰 Fetching articles from RSS feeds...")
-for url in FEEDS:
-    parsed = feedparser.parse(url)
-    feed_count = 0
-    for entry in parsed.entries[:15]:  # limit per feed
-        title = entry.get("title", "").strip()
-        summary = entry.get("summary", "").strip() or entry.get("description", "").strip()
-        link = entry.get("link", "").strip()
-        pub = entry.get("published", "")
-        source = urlparse(link).netloc
-
-        if not link or link in existing_links:
-            continue  # skip blank or duplicate
-
-        combined_text = f"{title} {summary}"
-
-        articles.append({
-            "title": title,
-            "link": link,
-            "published": pub,
-            "summary": summary,
-            "source": source,
-            "source_type": get_source_type(link),
-            "sentiment": classify_sentiment(combined_text),
-            "economy": detect_economy(combined_text),
-            "workstreams": tag_workstreams(combined_text),
-            "aligned_with_us": "Unclear",
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        feed_count += 1
-
-    print(f"📡 {url} → {feed_count} new articles")
-
-# === Save merged output ===
-all_articles = articles + existing_data
-all_articles = sorted(all_articles, key=lambda x: x["timestamp"], reverse=True)
-
-with open(processed_path, "w", encoding="utf-8") as f:
-    json.dump(all_articles, f, indent=2, ensure_ascii=False)
-
-print(f"\n✅ Added {len(articles)} new articles. Total in file: {len(all_articles)}")
+def new_entries(entries, seen_ids, limit=MAX_ENTRIES_PER_FEED):
+    """(entries to ingest this run, whether that leaves none behind).
+
+    At most `limit` entries not seen on an earlier run, in feed order (newest
+    first). Seen entries are skipped rather than ending the walk: entries
+    left over by the cap on the last run come after ones that were ingested.
+    """
+    unseen = [e for e in entries if entry_key(e) not in seen_ids]
+    return unseen[:limit], len(unseen) <= limit
+
+def build_article(entry):
+    """Turn one parsed feed entry into an article record, or None if it has no link.
+
+    Sentiment is left empty here and filled in by the batch scoring stage.
+    """
+    title = entry.get("title", "").strip()
+    summary = entry.get("summary", "").strip() or entry.get("description", "").strip()
+    link = clean_url(entry.get("link", ""))
+    pub = entry.get("published", "")
+    source = urlparse(link).netloc
+
+    if not link:
+        return None
+
+    combined_text = f"{title} {summary}"
+    economies = detect_economies(combined_text)
+
+    return {
+        "title": title,
+        "link": link,
+        "published": pub,
+        "summary": summary,
+        "source": source,
+        "source_type": get_source_type(link),
+        "sentiment": None,
+        "polarity": None,
+        "economy": economies[0] if economies else "Unknown",
+        "economies": ", ".join(economies) or "Unknown",
+        "workstreams": tag_workstreams(combined_text),
+        "aligned_with_us": "Unclear",
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+def ingest(run):
+    # === Open the article store (imports the old single-file archive once) ===
+    store = ArticleStore()
+    with run.stage("migrate"):
+        migrated = store.migrate_legacy()
+        existing_links = store.links()
+    if migrated:
+        print(f"📦 Migrated {migrated} articles from {store.legacy_path} into {store.root}/")
+
+    # === Index recent articles for duplicate detection ===
+    with run.stage("index"):
+        since = (datetime.utcnow() - timedelta(days=DEDUPE_WINDOW_DAYS)).isoformat()
+        recent = store.load(since=since, newest_first=False)
+        index = DuplicateIndex()
+        index.add(recent)
+        existing_keys = {url_key(link) for link in existing_links}
+        existing_keys.update(url_key(link) for a in recent for link in a.get("duplicate_links", []))
+
+    # === Fetch new articles ===
+    articles = []
+
+    feed_state = FeedStateStore()
+
+    print("🛰 Fetching articles from RSS feeds...")
+    with run.stage("fetch"):
+        results = fetch_feeds(FEEDS, state=feed_state)
+    for result in results:
+        run.record_http(result["host"], nbytes=result["bytes"], errors=1 if result["error"] else 0)
+
+    with run.stage("parse"):
+        for result in results:
+            url = result["url"]
+            if result["error"]:
+                print(f"⚠️ {url} → {result['error']} ({result['elapsed']:.2f}s)")
+                continue
+            if result["not_modified"]:
+                print(f"💤 {url} → not modified ({result['elapsed']:.2f}s)")
+                continue
+
+            entries, caught_up = new_entries(result["entries"], feed_state.seen_ids(url))
+            feed_count = 0
+            for entry in entries:
+                link = entry.get("link", "").strip()
+                key = url_key(link)
+                if not link or key in existing_keys:
+                    continue  # skip blank or duplicate (tracking parameters and www. ignored)
+                existing_keys.add(key)
+
+                articles.append(build_article(entry))
+                feed_count += 1
+
+            run.count("entries_parsed", len(result["entries"]))
+            # Only ingested entries count as seen. While some are left over, the validators
+            # of this copy aren't stored, so the next run gets the feed again instead of a 304
+            feed_state.update(
+                url,
+                etag=result["etag"] if caught_up else None,
+                last_modified=result["last_modified"] if caught_up else None,
+                entry_ids=[entry_key(e) for e in entries],
+            )
+            print(f"📡 {url} → {feed_count} new articles ({result['elapsed']:.2f}s, {result['bytes']} bytes)")
+
+    # === Fold syndicated copies of a story into one representative ===
+    with run.stage("dedupe"):
+        fetched = len(articles)
+        articles, updated = index.merge(articles)
+    if fetched > len(articles):
+        print(f"🧬 Folded {fetched - len(articles)} near-duplicate articles into existing stories")
+    run.count("near_duplicates", fetched - len(articles))
+    run.count("new_articles", len(articles))
+
+    # === Score sentiment in one batch, separate from network I/O ===
+    with run.stage("sentiment"):
+        scores = SentimentScorer().score_batch([f"{a['title']} {a['summary']}" for a in articles])
+        for article, (label, score) in zip(articles, scores):
+            article["sentiment"] = label
+            article["polarity"] = round(score, 4)
+
+    # === Append new articles only ===
+    with run.stage("write"):
+        # Representatives that gained a source are rewritten under their original timestamp
+        store.append(articles + updated)
+        if store.maybe_compact():
+            print("🧹 Compacted article segments")
+        feed_state.save()
+
+    # === Publish the columnar snapshot for the dashboard ===
+    try:
+        with run.stage("snapshot"):
+            snapshot_rows = update_snapshot(articles + updated, store)
+        print(f"🗜 Snapshot {SNAPSHOT_PATH} → {snapshot_rows} rows")
+    except ImportError:
+        print("⚠️ pyarrow not installed — skipping Parquet snapshot")
+
+    failed = [r for r in results if r["error"]]
+    run.count("feeds_failed", len(failed))
+    print(f"\n✅ Added {len(articles)} new articles. Total in store: {len(existing_links) + len(articles)}")
+    if failed:
+        print(f"⚠️ {len(failed)} of {len(results)} feeds failed: {', '.join(r['host'] for r in failed)}")
+
+def main():
+    with start_run("update_articles") as run:
+        ingest(run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Run metrics for the scheduled jobs: stage timings, counts, HTTP traffic and peak memory.
+
+A job opens a run with `start_run("update_articles")`. Its stages are
+timed with `run.stage("fetch")`. Library code (HTTP clients, writers)
+reports into whichever run is active through `current_run()`, which is a
+no-op when no run is open. When the run ends, a JSON report is written
+to RUN_REPORT_DIR.
+
+Set PROFILE_STAGE to a stage name (glob patterns allowed, e.g.
+"export_ot*") to dump a cProfile of matching stages next to the report.
+"""
+import cProfile
+import fnmatch
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+RUN_REPORT_DIR = os.environ.get("RUN_REPORT_DIR", ".cache/run_reports")
+PROFILE_STAGE = os.environ.get("PROFILE_STAGE", "")
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size of this process (or its finished children) in MB, or None where unsupported.
+
+    This is a high-water mark for the whole process lifetime, not for any
+    one stage.
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB on Linux
+    return round(usage.ru_maxrss * scale / 1024 / 1024, 1)
+
+
+class RunMetrics:
+    """Thread-safe collector for one job run."""
+
+    def __init__(self, job, report_dir=RUN_REPORT_DIR, profile_stage=PROFILE_STAGE):
+        self.job = job
+        self.report_dir = report_dir
+        self.profile_stage = profile_stage
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counts = defaultdict(int)
+        self.http = defaultdict(lambda: {"requests": 0, "bytes": 0, "retries": 0, "errors": 0})
+        self.profiles = []
+        self.error = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block; repeated stages accumulate. Profiled when PROFILE_STAGE matches.
+
+        `peak_rss_mb_so_far` is the process peak when the stage ended;
+        `rss_growth_mb` is how far the stage raised that peak (attributed to
+        every stage running at the time when stages overlap).
+        """
+        profiler = None
+        if self.profile_stage and fnmatch.fnmatch(name, self.profile_stage):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is already active on this interpreter
+                profiler = None
+        start = time.perf_counter()
+        rss_before = peak_rss_mb()
+        failed = False
+        try:
+            yield self
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                self._dump_profile(name, profiler)
+            rss_after = peak_rss_mb()
+            with self._lock:
+                entry = self.stages.setdefault(
+                    name, {"seconds": 0.0, "calls": 0, "failed": 0, "rss_growth_mb": 0.0 if rss_after else None}
+                )
+                entry["seconds"] += seconds
+                entry["calls"] += 1
+                entry["failed"] += failed
+                entry["peak_rss_mb_so_far"] = rss_after
+                if rss_after is not None:
+                    entry["rss_growth_mb"] = round(entry["rss_growth_mb"] + rss_after - rss_before, 1)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counts[name] += n
+
+    def record_http(self, host, requests=1, nbytes=0, retries=0, errors=0):
+        with self._lock:
+            stats = self.http[host]
+            stats["requests"] += requests
+            stats["bytes"] += nbytes
+            stats["retries"] += retries
+            stats["errors"] += errors
+
+    def _dump_profile(self, name, profiler):
+        os.makedirs(self.report_dir, exist_ok=True)
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        path = os.path.join(self.report_dir, f"{self.job}-{safe}.prof")
+        profiler.dump_stats(path)
+        with self._lock:
+            self.profiles.append(path)
+        print(f"🔬 Profile of stage '{name}' saved to {path} (view with: python -m pstats {path})")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+    def report(self):
+        with self._lock:
+            return {
+                "job": self.job,
+                "started_at": self.started_at.isoformat(),
+                "seconds": round(time.perf_counter() - self._start, 3),
+                "peak_rss_mb": peak_rss_mb(),
+                "error": self.error,
+                "stages": {k: dict(v, seconds=round(v["seconds"], 3)) for k, v in self.stages.items()},
+                "counts": dict(self.counts),
+                "http": {host: dict(v) for host, v in self.http.items()},
+                "http_totals": {
+                    key: sum(v[key] for v in self.http.values())
+                    for key in ("requests", "bytes", "retries", "errors")
+                },
+                "profiles": list(self.profiles),
+            }
+
+    def write(self):
+        """Write the report to <report_dir>/<job>.json and return the path."""
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = os.path.join(self.report_dir, f"{self.job}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+class _NoRun:
+    """Stand-in used when no run is active, so library code can always report."""
+
+    @contextmanager
+    def stage(self, name):
+        yield self
+
+    def count(self, name, n=1):
+        pass
+
+    def record_http(self, host, requests=1, nbytes=0, retries=0, errors=0):
+        pass
+
+
+_NO_RUN = _NoRun()
+_current = None
+
+
+def current_run():
+    return _current or _NO_RUN
+
+
+@contextmanager
+def start_run(job, **options):
+    """Open a run for `job`, make it current, and write its report when the block exits."""
+    global _current
+    previous, run = _current, RunMetrics(job, **options)
+    _current = run
+    try:
+        yield run
+    except BaseException as e:
+        run.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current = previous
+        path = run.write()
+        totals = run.report()["http_totals"]
+        print(f"📊 Run report saved to {path} ({run.report()['seconds']}s, "
+              f"{totals['requests']} HTTP requests, peak RSS {peak_rss_mb()} MB)")
@@ -1,5 +1,17 @@
+import os
+import sys
+from pathlib import Path
+
+import altair as alt
 import streamlit as st
-import pandas as pd
+
+from scenario_data import (
+    ROLLUP_PATH, SIGNALS_PATH, STATE_PATH, STRATEGIES_PATH, TOTALS_PATH, ScenarioData, file_mtimes,
+    heatmap_cells, read_momentum, read_rollup
+)
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "media-monitor"))  # signal scoring lives with the pipeline
+from signal_scores import HALF_LIFE_DAYS, SCORED_SCENARIOS, SCORES_PATH  # noqa: E402
 
 st.set_page_config(
     page_title="🧭 US APEC-RISE Scenario Watch",
@@ -11,17 +23,19 @@ st.title("🧭 US APEC-RISE Scenario Watch")
 st.markdown("Use this tool to flag risks to critical assumptions and trigger scenario alerts for adaptive management across APEC economies.")
 
 # === Load data ===
+# Parsed and joined once per version of the files; the mtimes in the key make
+# an updated CSV load on the next rerun. cache_resource shares one object
+# across reruns, and select() returns copies, so nothing here mutates it.
+@st.cache_resource(max_entries=1)
+def load_scenario_data(mtimes):
+    return ScenarioData.from_files(SIGNALS_PATH, STRATEGIES_PATH, TOTALS_PATH, STATE_PATH)
+
 try:
-    df_signals = pd.read_csv("data/risk_signals.csv")
-    strat_df = pd.read_csv("data/scenario_strategies.csv")
+    data = load_scenario_data(file_mtimes(SIGNALS_PATH, STRATEGIES_PATH, TOTALS_PATH, STATE_PATH))
 except Exception as e:
     st.error(f"❌ Error loading data files: {e}")
     st.stop()
 
-# Strip column names to avoid whitespace issues
-df_signals.columns = df_signals.columns.str.strip()
-strat_df.columns = strat_df.columns.str.strip()
-
 # === Define fixed dropdown options ===
 workstreams_list = [
     "Digital Trade",
@@ -48,41 +62,93 @@ all_economies = sorted([
     "Mexico", "New Zealand", "Papua New Guinea", "Peru", "Philippines", "Russia", "Singapore", "Chinese Taipei",
     "Thailand", "United States", "Vietnam"
 ])
-present_economies = sorted(df_signals["Economy"].dropna().unique().tolist())
-missing_economies = sorted(set(all_economies) - set(present_economies))
+missing_economies = sorted(set(all_economies) - set(data.economies))
 if missing_economies:
     st.warning(f"⚠️ Missing economies in signals: {', '.join(missing_economies)}")
 
+# === Portfolio Overview (heat map) ===
+# Reads only the weekly rollup cube written by generate_signals.py, so it
+# stays fast however long the signal history grows.
+@st.cache_resource(max_entries=1)
+def load_rollup(mtimes):
+    return read_rollup(ROLLUP_PATH)
+
+SCENARIO_SCHEMES = {"Pessimistic": "reds", "Optimistic": "greens", "Baseline": "goldorange"}
+
+st.markdown("### 🗺️ Portfolio Overview")
+if not os.path.exists(ROLLUP_PATH):
+    st.info(f"ℹ️ No rollup found at {ROLLUP_PATH}; run generate_signals.py to build the overview.")
+else:
+    cube = load_rollup(file_mtimes(ROLLUP_PATH))
+    col1, col2, col3, col4 = st.columns(4)
+    overview_scenario = col1.selectbox("Scenario", list(SCENARIO_SCHEMES), key="overview_scenario")
+    overview_weeks = col2.selectbox(
+        "Period", [4, 12, 26, None], index=1, key="overview_weeks",
+        format_func=lambda w: f"Last {w} weeks" if w else "All time"
+    )
+    overview_workstream = col3.selectbox(
+        "Workstream", ["All"] + sorted(cube["Workstream"].unique()), key="overview_workstream"
+    )
+    overview_metric = col4.radio("Show", ["Share", "Signals"], horizontal=True, key="overview_metric")
+
+    cells = heatmap_cells(cube, overview_scenario, overview_weeks, overview_workstream)
+    if cells.empty:
+        st.info("ℹ️ No signals in the selected period.")
+    else:
+        heatmap = alt.Chart(cells).mark_rect().encode(
+            x=alt.X("Assumption:N", title=None),
+            y=alt.Y("Economy:N", title=None),
+            color=alt.Color(
+                f"{overview_metric}:Q",
+                scale=alt.Scale(scheme=SCENARIO_SCHEMES[overview_scenario]),
+                legend=alt.Legend(format=".0%" if overview_metric == "Share" else "d")
+            ),
+            tooltip=[
+                "Economy", "Assumption",
+                alt.Tooltip("Signals:Q", title=f"{overview_scenario} signals"),
+                alt.Tooltip("Total:Q", title="All signals"),
+                alt.Tooltip("Share:Q", format=".0%")
+            ]
+        )
+        st.altair_chart(heatmap, use_container_width=True)
+
+# === Signal Momentum (decayed scores, 7/30/90-day windows) ===
+@st.cache_resource(max_entries=1)
+def load_momentum(mtimes):
+    return read_momentum(SCORES_PATH)
+
+st.markdown("### 📈 Signal Momentum")
+if not os.path.exists(SCORES_PATH):
+    st.info(f"ℹ️ No signal scores found at {SCORES_PATH}; run generate_signals.py to build them.")
+else:
+    momentum = load_momentum(file_mtimes(SCORES_PATH))
+    momentum_scenario = st.radio("Scenario", SCORED_SCENARIOS, horizontal=True, key="momentum_scenario")
+    momentum = momentum[momentum["Scenario"] == momentum_scenario].drop(columns="Scenario")
+    st.caption(
+        f"Score halves every {HALF_LIFE_DAYS} days. Trend: last 7 days' daily rate minus the 90-day rate. "
+        "Acceleration: this week's change in signals minus last week's."
+    )
+    st.dataframe(
+        momentum.sort_values(["Acceleration", "Trend"], ascending=False),
+        use_container_width=True, hide_index=True
+    )
+
 # === Sidebar Filters ===
 st.sidebar.header("🔍 Filter Scenario Signals")
 selected_economy = st.sidebar.selectbox("Economy", all_economies)
 # Use fixed lists for workstream and assumption
 selected_workstream = st.sidebar.selectbox("Workstream", workstreams_list)
 selected_assumption = st.sidebar.selectbox("Assumption", assumptions_list)
-signal_strengths = ["All"] + sorted(df_signals["Signal Strength"].dropna().unique().tolist())
+signal_strengths = ["All"] + data.strengths
 selected_strength = st.sidebar.selectbox("Signal Strength", signal_strengths)
 
-# === Apply Filters ===
-filtered = df_signals[
-    (df_signals["Economy"] == selected_economy) &
-    (df_signals["Workstream"] == selected_workstream) &
-    (df_signals["Assumption"] == selected_assumption)
-]
-if selected_strength != "All":
-    filtered = filtered[filtered["Signal Strength"] == selected_strength]
-
-# === Merge with universal strategy lookup ===
-merged = filtered.merge(
-    strat_df,
-    on=["Assumption", "Scenario"],
-    how="left"
-)
+# === Apply Filters (rows come pre-joined with the universal strategy lookup) ===
+merged = data.select(selected_economy, selected_workstream, selected_assumption, selected_strength)
 
 # === Check for missing strategies ===
 if merged["Recommended Adaptation Strategy"].isnull().all():
     st.error("❌ No adaptation strategies found for the selected Assumption/Scenario. Available combos:")
-    combos = strat_df[["Assumption", "Scenario"]].drop_duplicates()
-    st.table(combos)
+    st.table(data.strategy_combos())
     st.stop()
 
 # === Add Icons ===
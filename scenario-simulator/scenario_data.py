@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "media-monitor"))
+from signal_rollup import BASELINE, TOTALS_PATH  # noqa: E402
+from signal_scores import SignalScores  # noqa: E402
+
+SIGNALS_PATH = "data/risk_signals.csv"
+STRATEGIES_PATH = "data/scenario_strategies.csv"
+ROLLUP_PATH = "data/scenario_rollup.csv"
+STATE_PATH = "data/signal_state.json"  # written by generate_signals.py; lists the classified assumptions
+
+JOIN_KEYS = ["Assumption", "Scenario"]
+GROUP_KEYS = ["Economy", "Workstream", "Assumption"]
+
+
+def read_table(path):
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()  # avoid whitespace issues in hand-edited headers
+    return df
+
+
+def file_mtimes(*paths):
+    """Modification times of `paths` (None if missing), used as a cache key so edited files are reloaded."""
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in paths)
+
+
+def classified_assumptions(path=STATE_PATH):
+    """Assumption names the last generate_signals.py run classified articles against."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("assumptions", [])
+
+
+class ScenarioData:
+    """Signals joined once with their adaptation strategies, indexed for the sidebar filters.
+
+    `groups` maps (Economy, Workstream, Assumption) to the row positions
+    of that combination, so a filter change is a dict lookup plus a take
+    of the matching rows instead of a scan and a merge over every signal.
+
+    The signals file holds keyword hits only. With article `totals`, each
+    selection gets one Baseline row standing for the articles that hit
+    none of the assumption's keywords. Only `assumptions` generate_signals.py
+    actually classified get one; any other name has no Baseline verdict.
+    Without totals (files written before the sparse format) any Baseline
+    rows come from the signals file itself.
+    """
+
+    def __init__(self, signals, strategies, totals=None, assumptions=()):
+        self.signals = signals
+        self.strategies = strategies
+        self.joined = signals.merge(strategies, on=JOIN_KEYS, how="left")
+        self.groups = self.joined.groupby(GROUP_KEYS, sort=False).indices
+        self.articles = {}
+        self.assumptions = set(assumptions)
+        economies = set(signals["Economy"].dropna())
+        strengths = set(signals["Signal Strength"].dropna())
+        if totals is not None:
+            self.articles = totals.groupby(["Economy", "Workstream"])["Articles"].sum().to_dict()
+            economies |= set(totals["Economy"].dropna())
+            strengths.add(BASELINE["Signal Strength"])
+        self.economies = sorted(economies)
+        self.strengths = sorted(strengths)
+
+    @classmethod
+    def from_files(cls, signals_path=SIGNALS_PATH, strategies_path=STRATEGIES_PATH, totals_path=TOTALS_PATH,
+                   state_path=STATE_PATH):
+        totals = read_table(totals_path) if os.path.exists(totals_path) else None
+        return cls(read_table(signals_path), read_table(strategies_path), totals, classified_assumptions(state_path))
+
+    def baseline_row(self, economy, workstream, assumption, hits):
+        """The implied Baseline signal of a selection, joined with its strategy.
+
+        None if every article hit, or if `assumption` was never classified.
+        """
+        if assumption not in self.assumptions:
+            return None
+        count = self.articles.get((economy, workstream), 0) - hits
+        if count <= 0:
+            return None
+        row = pd.DataFrame([{
+            "Economy": economy,
+            "Workstream": workstream,
+            "Assumption": assumption,
+            "Justification": f"No signal keywords detected in {count} article(s).",
+            **BASELINE,
+        }])
+        return row.merge(self.strategies, on=JOIN_KEYS, how="left")
+
+    def select(self, economy, workstream, assumption, strength="All"):
+        """Joined rows for one filter combination, as a copy the caller may modify."""
+        positions = self.groups.get((economy, workstream, assumption), [])
+        rows = self.joined.iloc[positions]
+        baseline = self.baseline_row(economy, workstream, assumption, len(positions))
+        if baseline is not None:
+            rows = pd.concat([rows, baseline], ignore_index=True)
+        if strength != "All":
+            rows = rows[rows["Signal Strength"] == strength]
+        return rows.copy()
+
+    def strategy_combos(self):
+        return self.strategies[JOIN_KEYS].drop_duplicates()
+
+
+# === Overview heat map (reads only the pre-aggregated cube from generate_signals.py) ===
+def read_rollup(path=ROLLUP_PATH):
+    cube = read_table(path)
+    cube["Week"] = cube["Week"].fillna("").astype(str)
+    return cube
+
+
+def heatmap_cells(cube, scenario, weeks=None, workstream="All"):
+    """Signals per (Economy, Assumption) in `scenario`, with their share of all signals in the cell.
+
+    `weeks` keeps only the most recent that many weeks of the cube; None keeps all.
+    """
+    if workstream != "All":
+        cube = cube[cube["Workstream"] == workstream]
+    if weeks:
+        recent = sorted(w for w in cube["Week"].unique() if w)[-weeks:]
+        cube = cube[cube["Week"].isin(recent)]
+    cells = cube.groupby(["Economy", "Assumption"])["Signals"].sum().rename("Total").to_frame()
+    hits = cube[cube["Scenario"] == scenario].groupby(["Economy", "Assumption"])["Signals"].sum()
+    cells["Signals"] = hits.reindex(cells.index, fill_value=0)
+    cells["Share"] = cells["Signals"] / cells["Total"]
+    return cells.reset_index()
+
+
+# === Signal momentum (decayed scores and rolling windows from signal_scores.json) ===
+def read_momentum(path):
+    return pd.DataFrame(SignalScores(path).summary())
@@ -0,0 +1,18 @@
+import os
+import sys
+
+# The scripts import their siblings by bare name, as they do when run directly
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, ".github", "scripts"), os.path.join(ROOT, "media-monitor")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# upload_hyper_to_tableau reads its Tableau settings at import time
+for name, value in {
+    "TABLEAU_PAT_NAME": "test-token",
+    "TABLEAU_PAT_SECRET": "test-secret",
+    "TABLEAU_SITE_NAME": "test-site",
+    "TABLEAU_PROJECT_ID": "test-project",
+    "TABLEAU_REST_URL": "http://tableau.test",
+}.items():
+    os.environ.setdefault(name, value)
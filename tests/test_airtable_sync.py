@@ -0,0 +1,80 @@
+import pytest
+
+import airtable_sync
+from airtable_client import AirtableError
+from airtable_sync import AirtableReplica
+
+
+class FakeClient:
+    """Answers fetch_pages like Airtable: full listings, modified-since filters and `fields[]` listings."""
+
+    def __init__(self, records):
+        self.records = records   # id -> fields, in view order
+        self.modified = set()    # ids changed since the last sync
+        self.calls = []
+
+    def fetch_pages(self, table, view=None, params=None):
+        params = params or {}
+        self.calls.append(next(iter(params), "full"))
+        if "filterByFormula" in params:
+            ids = [rid for rid in self.records if rid in self.modified]
+        else:
+            ids = list(self.records)
+        field = params.get("fields[]")
+        if field is not None and not any(field in fields for fields in self.records.values()):
+            raise AirtableError(f"{table}: {{'error': {{'type': 'UNKNOWN_FIELD_NAME'}}}}")
+        return [
+            {"id": rid, "createdTime": "2025-01-01T00:00:00.000Z",
+             "fields": {field: self.records[rid][field]} if field else dict(self.records[rid])}
+            for rid in ids
+        ]
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    monkeypatch.setattr(airtable_sync, "PAGE_SIZE", 1)
+    return AirtableReplica(str(tmp_path / "replica.sqlite"))
+
+
+@pytest.fixture
+def client():
+    return FakeClient({
+        "rec1": {"Notes": "first", "Name": "Acme"},
+        "rec2": {"Name": "Globex"},
+        "rec3": {"Name": "Initech", "Notes": "third"},
+    })
+
+
+def test_incremental_sync_applies_changes_and_deletions(replica, client):
+    replica.sync(client, "OT4")
+    client.calls.clear()
+    client.records["rec1"]["Notes"] = "edited"
+    client.modified = {"rec1"}
+    del client.records["rec2"]
+
+    records = replica.sync(client, "OT4")
+
+    assert client.calls == ["filterByFormula", "fields[]"]
+    assert [(r["id"], r["fields"].get("Notes")) for r in records] == [("rec1", "edited"), ("rec3", "third")]
+
+
+def test_id_listing_uses_the_field_set_on_most_records(replica, client):
+    replica.sync(client, "OT4")
+    client.calls.clear()
+
+    replica.sync(client, "OT4")
+
+    assert client.calls == ["filterByFormula", "fields[]"]
+    assert replica._cursor("OT4", "")[1] == "Name"
+
+
+def test_failed_id_listing_falls_back_to_a_full_read(replica, client):
+    replica.sync(client, "OT4")
+    client.calls.clear()
+    # "Name" renamed in Airtable: the ID-only listing now asks for an unknown field
+    client.records = {rid: {"Firm": fields["Name"]} for rid, fields in client.records.items() if rid != "rec3"}
+
+    records = replica.sync(client, "OT4")
+
+    assert client.calls == ["filterByFormula", "fields[]", "full"]
+    assert [(r["id"], r["fields"]) for r in records] == [("rec1", {"Firm": "Acme"}), ("rec2", {"Firm": "Globex"})]
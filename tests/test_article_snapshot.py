@@ -0,0 +1,65 @@
+import builtins
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from article_snapshot import read_snapshot, update_snapshot  # noqa: E402
+
+
+class StubStore:
+    """Article store that counts full loads."""
+
+    def __init__(self, articles):
+        self.articles = articles
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return list(self.articles)
+
+
+def article(n, timestamp):
+    return {"title": f"Story {n}", "link": f"https://news.test/{n}", "economy": "Peru", "timestamp": timestamp}
+
+
+def test_missing_snapshot_is_built_from_the_store(tmp_path):
+    store = StubStore([article(1, "2025-08-01"), article(2, "2025-08-02")])
+
+    assert update_snapshot([], store, str(tmp_path / "articles.parquet")) == 2
+    assert store.loads == 1
+
+
+def test_new_articles_are_folded_in_without_loading_the_store(tmp_path):
+    path = str(tmp_path / "articles.parquet")
+    store = StubStore([article(1, "2025-08-01")])
+    update_snapshot([], store, path)
+
+    assert update_snapshot([article(2, "2025-08-02")], store, path) == 2
+    assert store.loads == 1
+    assert list(read_snapshot(path)["title"]) == ["Story 2", "Story 1"]
+
+
+def test_corrupt_snapshot_is_rebuilt(tmp_path):
+    path = tmp_path / "articles.parquet"
+    path.write_bytes(b"not parquet")
+    store = StubStore([article(1, "2025-08-01")])
+
+    assert update_snapshot([], store, str(path)) == 1
+    assert store.loads == 1
+
+
+def test_without_pyarrow_the_store_is_not_loaded(tmp_path, monkeypatch):
+    real_import = builtins.__import__
+
+    def no_pyarrow(name, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+    store = StubStore([article(1, "2025-08-01")])
+
+    with pytest.raises(ImportError):
+        update_snapshot([article(2, "2025-08-02")], store, str(tmp_path / "articles.parquet"))
+    assert store.loads == 0
@@ -0,0 +1,20 @@
+from economy_tagger import ECONOMY_ALIASES, ECONOMY_PLACES, EconomyTagger
+
+TAGGER = EconomyTagger(ECONOMY_ALIASES, places=ECONOMY_PLACES)
+
+
+def test_ottawa_convention_does_not_tag_canada():
+    text = "Thailand accuses Cambodia of breaching the Ottawa Convention after a landmine blast"
+
+    assert TAGGER.tag(text) == ["Thailand"]
+
+
+def test_named_economy_ranks_before_demonyms():
+    text = "Chinese investors back a Japanese port deal; Japan confirms the terms"
+
+    assert TAGGER.tag(text) == ["Japan", "China"]
+
+
+def test_exclusions_swallow_the_alias_inside_them():
+    assert TAGGER.tag("North Korea fires missile") == []
+    assert TAGGER.tag("South Korea and North Korea hold talks") == ["Korea"]
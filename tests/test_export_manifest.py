@@ -0,0 +1,41 @@
+import json
+
+import pandas as pd
+
+from export_manifest import open_export, write_if_changed
+
+
+def export(df, output_file, manifest_path):
+    with open_export(str(output_file), str(manifest_path)) as csvfile:
+        df.to_csv(csvfile, index=False)
+
+
+def test_unchanged_data_with_a_new_timestamp_is_not_rewritten(tmp_path):
+    output_file, manifest_path = tmp_path / "OC1.csv", tmp_path / "export_manifest.json"
+    df = pd.DataFrame({"Name": ["Reform A", "Reform B"], "Economy (Name)": ["Peru", "Chile"]})
+    export(df.assign(**{"Last Updated": "2025-08-01T00:00:00"}), output_file, manifest_path)
+
+    export(df.assign(**{"Last Updated": "2025-08-02T00:00:00"}), output_file, manifest_path)
+
+    assert "2025-08-01T00:00:00" in output_file.read_text()
+    assert "2025-08-02T00:00:00" not in output_file.read_text()
+
+
+def test_changed_data_is_rewritten(tmp_path):
+    output_file, manifest_path = tmp_path / "OC1.csv", tmp_path / "export_manifest.json"
+    df = pd.DataFrame({"Name": ["Reform A"], "Last Updated": ["2025-08-01T00:00:00"]})
+    export(df, output_file, manifest_path)
+    first = json.loads(manifest_path.read_text())[str(output_file)]["fingerprint"]
+
+    assert write_if_changed(str(output_file), "Name,Last Updated\nReform B,2025-08-02T00:00:00\n", str(manifest_path))
+    assert output_file.read_text() == "Name,Last Updated\nReform B,2025-08-02T00:00:00\n"
+    assert json.loads(manifest_path.read_text())[str(output_file)]["fingerprint"] != first
+
+
+def test_existing_file_without_a_manifest_entry_is_kept(tmp_path):
+    output_file, manifest_path = tmp_path / "OC1.csv", tmp_path / "export_manifest.json"
+    output_file.write_text("Name,Last Updated\nReform A,2025-08-01T00:00:00\n")
+
+    assert not write_if_changed(str(output_file), "Name,Last Updated\nReform A,2025-09-01T00:00:00\n",
+                                str(manifest_path))
+    assert "2025-08-01" in output_file.read_text()
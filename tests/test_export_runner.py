@@ -0,0 +1,150 @@
+import json
+import sys
+import threading
+import time
+import types
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+import pytest
+
+import airtable_client
+from airtable_client import AirtableClient, RateLimiter, ResponseCache
+from export_runner import run_exports
+
+BASE_ID = "appTEST"
+PAGE_SIZE = 2
+ECONOMY_ID = "rec" + "E" * 14
+WORKSTREAM_ID = "rec" + "W" * 14
+FIRM_ID = "rec" + "F" * 14
+TABLES = {
+    "Economy Reference List": [{"id": ECONOMY_ID, "fields": {"Economy": "Thailand"}}],
+    "Workstream Reference List": [{"id": WORKSTREAM_ID, "fields": {"Workstream": "Digital Trade"}}],
+    "OT3 RISE Mentions": [
+        {"id": f"recOT3{i:011d}", "fields": {"Economy": [ECONOMY_ID], "Workstream": [WORKSTREAM_ID], "N": i}}
+        for i in range(5)
+    ],
+    "OT4 Private Sector Firms": [{"id": FIRM_ID, "fields": {"Firm": "Acme Logistics"}}],
+    "OC1 Policy Reforms": [
+        {"id": f"recOC1{i:011d}", "fields": {"Economy": [ECONOMY_ID], "Workstream": [WORKSTREAM_ID]}}
+        for i in range(3)
+    ],
+}
+
+
+class MockAirtable(BaseHTTPRequestHandler):
+    """Lists TABLES the way Airtable does: PAGE_SIZE records per page, continued with `offset`."""
+
+    requests = Counter()
+    throttle_next = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        _, version, base, table = parts.path.split("/", 3)
+        table = unquote(table)
+        with self.lock:
+            MockAirtable.requests[table] += 1
+            throttled = MockAirtable.throttle_next > 0
+            MockAirtable.throttle_next -= throttled
+        if throttled:
+            return self.reply(429, {"errors": [{"error": {"type": "RATE_LIMIT_REACHED"}}]})
+        if (version, base) != ("v0", BASE_ID) or table not in TABLES:
+            return self.reply(404, {"error": {"type": "TABLE_NOT_FOUND"}})
+        start = int(parse_qs(parts.query).get("offset", ["0"])[0])
+        page = {"records": TABLES[table][start:start + PAGE_SIZE]}
+        if start + PAGE_SIZE < len(TABLES[table]):
+            page["offset"] = str(start + PAGE_SIZE)
+        self.reply(200, page)
+
+    def reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), MockAirtable)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    MockAirtable.requests = Counter()
+    MockAirtable.throttle_next = 0
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/v0"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(api_url):
+    return AirtableClient("test-token", base_id=BASE_ID, api_url=api_url, rate=1000)
+
+
+def test_fetch_all_records_follows_pagination(client):
+    records = client.fetch_all_records("OT3 RISE Mentions")
+
+    assert [r["fields"]["N"] for r in records] == [0, 1, 2, 3, 4]
+    assert MockAirtable.requests["OT3 RISE Mentions"] == 3
+
+
+def test_rate_limited_request_is_retried(client, monkeypatch):
+    monkeypatch.setattr(airtable_client, "RETRY_AFTER_429", 0)
+    MockAirtable.throttle_next = 1
+
+    assert len(client.fetch_all_records("OC1 Policy Reforms")) == 3
+
+
+def test_parallel_exports_share_reference_tables(client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    results = run_exports(["export_ot3", "export_oc1"], client, max_workers=2)
+
+    assert [r["error"] for r in results] == [None, None]
+    assert MockAirtable.requests["Economy Reference List"] == 1
+    assert MockAirtable.requests["Workstream Reference List"] == 1
+    ot3 = pd.read_csv(tmp_path / "OT3.csv")
+    assert len(ot3) == 5
+    assert set(ot3["Economy (Name)"]) == {"Thailand"}
+    assert (tmp_path / "OC1.csv").exists()
+
+
+def test_failed_export_is_reported_not_raised(client, tmp_path, monkeypatch):
+    def broken(client):
+        raise KeyError("Indicator ID")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(sys.modules, "export_broken", types.SimpleNamespace(export=broken))
+    broken_result, ot3_result = run_exports(["export_broken", "export_ot3"], client)
+
+    assert broken_result["error"] == "KeyError: 'Indicator ID'"
+    assert ot3_result["error"] is None and (tmp_path / "OT3.csv").exists()
+
+
+def test_only_reference_lists_are_cached_across_runs(api_url, tmp_path, monkeypatch):
+    def lookups():
+        client = AirtableClient("test-token", base_id=BASE_ID, api_url=api_url, rate=1000,
+                                cache=ResponseCache(str(tmp_path / "cache")))
+        return client.lookup("Economy Reference List", "Economy"), client.lookup("OT4 Private Sector Firms", "Firm")
+
+    lookups()
+    monkeypatch.setitem(TABLES, "OT4 Private Sector Firms", [{"id": FIRM_ID, "fields": {"Firm": "Acme Freight"}}])
+    economies, firms = lookups()
+
+    assert economies[ECONOMY_ID] == "Thailand"
+    assert MockAirtable.requests["Economy Reference List"] == 1
+    assert firms[FIRM_ID] == "Acme Freight"
+    assert MockAirtable.requests["OT4 Private Sector Firms"] == 2
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 5 / 50
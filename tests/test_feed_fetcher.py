@@ -0,0 +1,100 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from feed_fetcher import fetch_feeds
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Fixture</title>
+<item><title>Thailand signs trade deal</title><link>https://news.test/a?utm_source=rss</link>
+<description>Bangkok and partners agreed on customs reform.</description>
+<pubDate>Mon, 04 Aug 2025 10:00:00 GMT</pubDate></item>
+<item><title>Second story</title><link>https://news.test/b</link><description>More news.</description></item>
+</channel></rss>"""
+ETAG = '"v1"'
+
+
+class StubFeeds(BaseHTTPRequestHandler):
+    """Serves fixture feeds; /slow/* holds the connection open to expose concurrency."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path.startswith("/slow/"):
+            with self.lock:
+                StubFeeds.active += 1
+                StubFeeds.peak = max(StubFeeds.peak, StubFeeds.active)
+            time.sleep(0.2)
+            with self.lock:
+                StubFeeds.active -= 1
+        if self.path == "/missing.xml":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path == "/hang.xml":
+            time.sleep(1)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = FEED.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubFeeds)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    StubFeeds.active = StubFeeds.peak = 0
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_results_keep_feed_order_and_record_failures(server):
+    urls = [f"{server}/feed.xml", f"{server}/missing.xml"]
+    ok, missing = fetch_feeds(urls)
+
+    assert ok["url"] == urls[0] and ok["status"] == 200 and ok["error"] is None
+    assert [e.title for e in ok["entries"]] == ["Thailand signs trade deal", "Second story"]
+    assert ok["bytes"] > 0 and ok["etag"] == ETAG
+    assert missing["status"] == 404 and missing["error"] == "HTTP 404" and missing["entries"] == []
+
+
+def test_per_host_limit_caps_concurrent_requests(server):
+    urls = [f"{server}/slow/{i}.xml" for i in range(6)]
+    results = fetch_feeds(urls, max_workers=6, per_host_limit=2)
+
+    assert all(r["error"] is None for r in results)
+    assert StubFeeds.peak == 2
+
+
+def test_slow_host_times_out_without_failing_the_batch(server):
+    host = server.split("//", 1)[1]
+    ok, hung = fetch_feeds([f"{server}/feed.xml", f"{server}/hang.xml"], host_timeouts={host: 0.3})
+
+    assert ok["error"] is None
+    assert hung["error"] and hung["entries"] == []
+
+
+def test_fetched_entries_build_the_same_article_dicts(server):
+    update_articles = pytest.importorskip("update_articles")
+    result, = fetch_feeds([f"{server}/feed.xml"])
+    article = update_articles.build_article(result["entries"][0])
+
+    assert article["title"] == "Thailand signs trade deal"
+    assert article["link"] == "https://news.test/a"
+    assert article["economy"] == "Thailand"
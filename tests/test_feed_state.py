@@ -0,0 +1,100 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from feed_fetcher import fetch_feeds
+from feed_state import FeedStateStore, entry_key
+
+ETAG = '"v1"'
+
+
+def feed_xml(count):
+    items = "".join(
+        f"<item><title>Story {i}</title><link>https://news.test/{i}</link><guid>story-{i}</guid></item>"
+        for i in reversed(range(count))
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Fixture</title>{items}</channel></rss>'
+
+
+class StubFeed(BaseHTTPRequestHandler):
+    """One feed of `items` entries, newest first, answering 304 to its ETag."""
+
+    items = 3
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = feed_xml(StubFeed.items).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubFeed)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    StubFeed.items = 3
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/feed.xml"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def ingest_once(url, state, limit):
+    """The feed handling of update_articles.ingest: fetch, pick new entries, update the state."""
+    update_articles = pytest.importorskip("update_articles")
+    result, = fetch_feeds([url], state=state)
+    if result["not_modified"]:
+        return result, []
+    entries, caught_up = update_articles.new_entries(result["entries"], state.seen_ids(url), limit=limit)
+    state.update(
+        url,
+        etag=result["etag"] if caught_up else None,
+        last_modified=result["last_modified"] if caught_up else None,
+        entry_ids=[entry_key(e) for e in entries],
+    )
+    return result, [e.title for e in entries]
+
+
+def test_conditional_get_reports_not_modified(url, tmp_path):
+    state = FeedStateStore(str(tmp_path / "feed_state.json"))
+    first, = fetch_feeds([url], state=state)
+    state.update(url, etag=first["etag"], last_modified=first["last_modified"])
+
+    second, = fetch_feeds([url], state=state)
+    assert second["not_modified"] and second["error"] is None and second["entries"] == []
+
+
+def test_seen_entries_are_not_ingested_again(url, tmp_path):
+    state = FeedStateStore(str(tmp_path / "feed_state.json"))
+    ingest_once(url, state, limit=15)
+    state.feeds[url].pop("etag")  # force a full download
+    StubFeed.items = 5
+
+    _, titles = ingest_once(url, state, limit=15)
+    assert titles == ["Story 4", "Story 3"]
+
+
+def test_entries_beyond_the_cap_are_ingested_next_run(url, tmp_path):
+    state = FeedStateStore(str(tmp_path / "feed_state.json"))
+    StubFeed.items = 5
+
+    first, titles = ingest_once(url, state, limit=3)
+    assert titles == ["Story 4", "Story 3", "Story 2"]
+    assert state.seen_ids(url) == {"story-4", "story-3", "story-2"}
+
+    second, titles = ingest_once(url, state, limit=3)
+    assert not second["not_modified"]
+    assert titles == ["Story 1", "Story 0"]
+
+    third, titles = ingest_once(url, state, limit=3)
+    assert third["not_modified"] and titles == []
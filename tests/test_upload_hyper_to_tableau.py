@@ -0,0 +1,98 @@
+import argparse
+import types
+from contextlib import nullcontext
+
+import pytest
+
+pytest.importorskip("tableauhyperapi")
+pytest.importorskip("tableauserverclient")
+
+import upload_hyper_to_tableau as up  # noqa: E402
+from export_manifest import load_manifest  # noqa: E402
+
+
+class StubServer:
+    """Stands in for TSC.Server: records publishes and fails for the extract names in `failing`."""
+
+    PublishMode = up.TSC.Server.PublishMode
+    failing = set()
+    published = []
+    refreshed = []
+
+    def __init__(self, *args, **kwargs):
+        self.auth = types.SimpleNamespace(sign_in=lambda auth: nullcontext())
+        self.datasources = types.SimpleNamespace(publish=self.publish)
+        self.workbooks = types.SimpleNamespace(get=self.get_workbooks, refresh=self.refresh)
+
+    def publish(self, item, path, mode=None):
+        if item.name in self.failing:
+            raise RuntimeError(f"upload of {item.name} rejected")
+        self.published.append(item.name)
+        return types.SimpleNamespace(id=f"ds-{item.name}")
+
+    def get_workbooks(self):
+        return [types.SimpleNamespace(name=name, id=f"wb-{name}") for name in up.WORKBOOKS_TO_REFRESH], None
+
+    def refresh(self, workbook):
+        self.refreshed.append(workbook.name)
+        return types.SimpleNamespace(id="job-1")
+
+
+def fake_convert(csv_path, hyper_path, hyper=None):
+    with open(hyper_path, "wb") as f:
+        f.write(b"hyper:" + open(csv_path, "rb").read())
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(up, "PUBLISH_MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(up, "convert_csv_to_hyper", fake_convert)
+    monkeypatch.setattr(up, "start_hyper", lambda: nullcontext(None))
+    monkeypatch.setattr(up.TSC, "Server", StubServer)
+    monkeypatch.setattr(StubServer, "failing", set())
+    monkeypatch.setattr(StubServer, "published", [])
+    monkeypatch.setattr(StubServer, "refreshed", [])
+    for name in ("OT1.csv", "OT2.csv"):
+        (tmp_path / name).write_text("Economy,Amount\nThailand,1\n", encoding="utf-8")
+    return tmp_path
+
+
+def run_upload():
+    up.upload(argparse.Namespace(single_extract=False))
+
+
+def test_unchanged_csvs_are_skipped_on_the_next_run(workdir):
+    run_upload()
+    assert sorted(StubServer.published) == ["OT1 Extract", "OT2 Extract"]
+    assert StubServer.refreshed == up.WORKBOOKS_TO_REFRESH
+
+    StubServer.published.clear()
+    (workdir / "OT2.csv").write_text("Economy,Amount\nThailand,2\n", encoding="utf-8")
+    run_upload()
+    assert StubServer.published == ["OT2 Extract"]
+
+
+def test_partial_publish_failure_keeps_the_successful_datasets(workdir):
+    StubServer.failing = {"OT2 Extract"}
+    changed = {"OT1.csv": "fp-1", "OT2.csv": "fp-2"}
+    published = {}
+
+    timings = up.convert_and_publish(StubServer(), None, changed, published)
+
+    assert timings["OT1.csv"]["error"] is None and timings["OT1.csv"]["publish"] is not None
+    assert timings["OT2.csv"]["error"].startswith("publish:")
+    assert published == {"OT1.csv": {"fingerprint": "fp-1", "datasource_id": "ds-OT1 Extract"}}
+    assert load_manifest(up.PUBLISH_MANIFEST_PATH) == published
+
+
+def test_failed_dataset_is_retried_and_the_run_fails(workdir):
+    StubServer.failing = {"OT2 Extract"}
+    with pytest.raises(SystemExit):
+        run_upload()
+    assert StubServer.published == ["OT1 Extract"]
+
+    StubServer.failing = set()
+    StubServer.published.clear()
+    run_upload()
+    assert StubServer.published == ["OT2 Extract"]